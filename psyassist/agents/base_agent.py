@@ -9,8 +9,9 @@ import uuid
 
 from crewai import Agent
 
-from ..schemas.session import Session
+from ..schemas.session import Session, SessionState
 from ..schemas.events import BaseEvent, EventType, EventPriority
+from ..schemas.risk import ELEVATED_SEVERITIES
 from ..tools import RiskClassifier, PIIRedactor
 
 # Simple base tool class for compatibility
@@ -106,7 +107,7 @@ Always prioritize user safety and escalate when in doubt.
         assessment = await self.risk_classifier.assess_risk(text, context)
         
         # Update session with risk flags
-        if assessment.overall_severity.value not in ['NONE', 'LOW']:
+        if assessment.overall_severity in ELEVATED_SEVERITIES:
             session.risk_flags.append(assessment.overall_severity.value)
         
         return {
@@ -196,7 +197,7 @@ Always prioritize user safety and escalate when in doubt.
             return True
         
         # Check session state
-        if session.state.value in ['ESCALATE', 'CLOSE']:
+        if session.state in (SessionState.ESCALATE, SessionState.CLOSE):
             return True
         
         # Check message count
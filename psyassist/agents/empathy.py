@@ -8,14 +8,14 @@ from datetime import datetime
 from .base_agent import BasePsyAssistAgent
 from ..schemas.session import Session, SessionState
 from ..schemas.events import EventType, EventPriority
-from ..config.prompts import EmpathyPrompt
+from ..config.prompts import get_prompt
 
 
 class EmpathyAgent(BasePsyAssistAgent):
     """Empathy agent for active listening and emotional support."""
     
     def __init__(self, **kwargs):
-        prompt_config = EmpathyPrompt()
+        prompt_config = get_prompt("empathy")
         super().__init__(
             name="Empathy",
             prompt_config=prompt_config,
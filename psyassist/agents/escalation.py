@@ -9,7 +9,7 @@ from .base_agent import BasePsyAssistAgent
 from ..schemas.session import Session, SessionState
 from ..schemas.events import EventType, EventPriority
 from ..schemas.resources import Resource
-from ..config.prompts import EscalationPrompt
+from ..config.prompts import get_prompt
 from ..tools import WarmTransferAPI, DirectoryLookup
 
 
@@ -17,7 +17,7 @@ class EscalationAgent(BasePsyAssistAgent):
     """Escalation agent for handling transitions to human support."""
     
     def __init__(self, warm_transfer_api: WarmTransferAPI = None, directory_lookup: DirectoryLookup = None, **kwargs):
-        prompt_config = EscalationPrompt()
+        prompt_config = get_prompt("escalation")
         super().__init__(
             name="Escalation",
             prompt_config=prompt_config,
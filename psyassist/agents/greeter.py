@@ -8,7 +8,7 @@ from datetime import datetime, timedelta
 from .base_agent import BasePsyAssistAgent
 from ..schemas.session import Session, SessionState, ConsentStatus
 from ..schemas.events import EventType, EventPriority
-from ..config.prompts import GreeterPrompt
+from ..config.prompts import get_prompt
 from ..config.settings import settings
 
 
@@ -16,7 +16,7 @@ class GreeterAgent(BasePsyAssistAgent):
     """Greeter agent for welcoming users and obtaining consent."""
     
     def __init__(self, **kwargs):
-        prompt_config = GreeterPrompt()
+        prompt_config = get_prompt("greeter")
         super().__init__(
             name="Greeter",
             prompt_config=prompt_config,
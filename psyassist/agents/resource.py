@@ -8,8 +8,8 @@ from datetime import datetime
 from .base_agent import BasePsyAssistAgent
 from ..schemas.session import Session, SessionState
 from ..schemas.events import EventType, EventPriority
-from ..schemas.resources import Resource, ResourceCategory
-from ..config.prompts import ResourcePrompt
+from ..schemas.resources import Resource, ResourceCategory, CRISIS_CATEGORIES
+from ..config.prompts import get_prompt
 from ..tools import DirectoryLookup
 
 
@@ -17,7 +17,7 @@ class ResourceAgent(BasePsyAssistAgent):
     """Resource agent for providing support resources and information."""
     
     def __init__(self, directory_lookup: DirectoryLookup = None, **kwargs):
-        prompt_config = ResourcePrompt()
+        prompt_config = get_prompt("resource")
         super().__init__(
             name="Resource",
             prompt_config=prompt_config,
@@ -120,14 +120,16 @@ class ResourceAgent(BasePsyAssistAgent):
         
         categories = need_to_category.get(primary_need, [ResourceCategory.GENERAL_SUPPORT.value])
         
-        # Get resources
-        resources = await self.directory_lookup.get_resources(location, categories)
-        
-        # If urgent, prioritize crisis resources
+        # Get resources, fetching crisis resources alongside when urgent
         if is_urgent:
-            crisis_resources = await self.directory_lookup.get_crisis_resources(location)
-            if crisis_resources:
-                resources = crisis_resources + resources
+            crisis_resources, resources = await self.directory_lookup.get_many([
+                (location, CRISIS_CATEGORIES),
+                (location, categories)
+            ])
+            # Prioritize crisis resources
+            resources = crisis_resources + resources
+        else:
+            resources = await self.directory_lookup.get_resources(location, categories)
         
         # Limit to top 3 resources
         return resources[:3]
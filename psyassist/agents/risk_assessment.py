@@ -8,14 +8,15 @@ from datetime import datetime
 from .base_agent import BasePsyAssistAgent
 from ..schemas.session import Session, SessionState
 from ..schemas.events import EventType, EventPriority
-from ..config.prompts import RiskAssessmentPrompt
+from ..schemas.risk import RiskSeverity
+from ..config.prompts import get_prompt
 
 
 class RiskAssessmentAgent(BasePsyAssistAgent):
     """RiskAssessment agent for continuous safety monitoring."""
     
     def __init__(self, **kwargs):
-        prompt_config = RiskAssessmentPrompt()
+        prompt_config = get_prompt("risk_assessment")
         super().__init__(
             name="RiskAssessment",
             prompt_config=prompt_config,
@@ -87,7 +88,7 @@ class RiskAssessmentAgent(BasePsyAssistAgent):
             return 'emergency_response'
         elif risk_assessment['should_escalate']:
             return 'escalation'
-        elif assessment.overall_severity.value in ['MEDIUM', 'HIGH']:
+        elif assessment.overall_severity in (RiskSeverity.MEDIUM, RiskSeverity.HIGH):
             return 'increased_monitoring'
         else:
             return 'continue_monitoring'
@@ -8,14 +8,14 @@ from datetime import datetime
 from .base_agent import BasePsyAssistAgent
 from ..schemas.session import Session, SessionState
 from ..schemas.events import EventType, EventPriority
-from ..config.prompts import TherapyGuidePrompt
+from ..config.prompts import get_prompt
 
 
 class TherapyGuideAgent(BasePsyAssistAgent):
     """TherapyGuide agent for providing coping techniques and micro-interventions."""
     
     def __init__(self, **kwargs):
-        prompt_config = TherapyGuidePrompt()
+        prompt_config = get_prompt("therapy_guide")
         super().__init__(
             name="TherapyGuide",
             prompt_config=prompt_config,
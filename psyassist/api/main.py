@@ -2,7 +2,9 @@
 Main FastAPI application for PsyAssist AI.
 """
 
+from dataclasses import asdict
 from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import Dict, Any, Optional, List
 import asyncio
@@ -10,8 +12,16 @@ import asyncio
 from ..core.orchestrator import PsyAssistOrchestrator
 from ..schemas.session import Session, SessionUpdate
 from ..schemas.risk import RiskAssessment
+from ..schemas._json import dumps
 from ..config.settings import settings
 
+
+class PydanticJSONResponse(JSONResponse):
+    """JSON response rendered by pydantic-core instead of the stdlib json module."""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
 # Create FastAPI app
 app = FastAPI(
     title="PsyAssist AI",
@@ -20,11 +30,15 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     debug=True,
+    default_response_class=PydanticJSONResponse,
 )
 
 # Create orchestrator instance
 orchestrator = PsyAssistOrchestrator()
 
+# Background tasks started by the app, held so the event loop cannot drop them
+running_tasks: set = set()
+
 # Request/Response models
 class CreateSessionRequest(BaseModel):
     user_id: Optional[str] = None
@@ -63,8 +77,21 @@ async def cleanup_expired_sessions():
 @app.on_event("startup")
 async def startup_event():
     """Startup event handler."""
-    # Start background cleanup task
-    asyncio.create_task(cleanup_expired_sessions())
+    # Start background cleanup task, keeping a reference so it is not garbage collected
+    task = asyncio.create_task(cleanup_expired_sessions())
+    running_tasks.add(task)
+    task.add_done_callback(running_tasks.discard)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Shutdown event handler."""
+    for task in list(running_tasks):
+        task.cancel()
+    # Persist sessions held in memory
+    orchestrator.sessions.close()
+    # Close pooled HTTP connections
+    await orchestrator.directory_lookup.aclose()
+    await orchestrator.warm_transfer_api.aclose()
 
 # Health check endpoint
 @app.get("/health")
@@ -118,11 +145,12 @@ async def get_session(
         "state": session.state.value,
         "consent_status": session.consent_status.value,
         "message_count": session.message_count,
-        "risk_flags": session.risk_flags,
+        "risk_flags": list(session.risk_flags),
+        "transitions": [asdict(record) for record in session.transitions],
         "created_at": session.created_at.isoformat(),
         "updated_at": session.updated_at.isoformat(),
         "expires_at": session.expires_at.isoformat() if session.expires_at else None,
-        "metadata": session.metadata
+        "metadata": dict(session.metadata)
     }
 
 @app.put("/sessions/{session_id}", response_model=Dict[str, Any])
@@ -2,6 +2,7 @@
 Prompt configurations for PsyAssist AI agents.
 """
 
+from functools import cache
 from typing import Dict, List
 from pydantic import BaseModel, Field
 
@@ -226,3 +227,20 @@ class PromptConfig(BaseModel):
     
     I'll help you prepare for this conversation. What would you like to focus on?
     """
+
+
+# Shared prompt instances keyed by agent name
+_PROMPTS: Dict[str, AgentPrompt] = {
+    "greeter": GreeterPrompt(),
+    "empathy": EmpathyPrompt(),
+    "therapy_guide": TherapyGuidePrompt(),
+    "risk_assessment": RiskAssessmentPrompt(),
+    "resource": ResourcePrompt(),
+    "escalation": EscalationPrompt(),
+}
+
+
+@cache
+def get_prompt(name: str) -> AgentPrompt:
+    """Get the shared prompt configuration for an agent by name."""
+    return _PROMPTS[name]
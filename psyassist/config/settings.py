@@ -4,7 +4,7 @@ Main settings configuration for PsyAssist AI.
 
 import os
 from typing import Optional, List
-from pydantic import Field, validator
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
@@ -35,6 +35,9 @@ class Settings(BaseSettings):
     session_timeout_minutes: int = Field(30, env="SESSION_TIMEOUT_MINUTES")
     max_messages_per_session: int = Field(50, env="MAX_MESSAGES_PER_SESSION")
     session_cleanup_interval_minutes: int = Field(60, env="SESSION_CLEANUP_INTERVAL_MINUTES")
+    # Disk tier for sessions; its I/O blocks the event loop, so keep it for development and tests
+    session_store_path: Optional[str] = Field(None, env="SESSION_STORE_PATH")
+    session_store_hot_size: int = Field(10000, env="SESSION_STORE_HOT_SIZE")
     
     # Risk Assessment Configuration
     risk_assessment_interval_messages: int = Field(3, env="RISK_ASSESSMENT_INTERVAL_MESSAGES")
@@ -43,6 +46,8 @@ class Settings(BaseSettings):
     
     # Event System Configuration
     event_batch_size: int = Field(10, env="EVENT_BATCH_SIZE")
+    event_batch_interval_ms: int = Field(5, env="EVENT_BATCH_INTERVAL_MS")
+    event_queue_max_size: int = Field(10000, env="EVENT_QUEUE_MAX_SIZE")
     
     # Logging
     log_level: str = Field("INFO", env="LOG_LEVEL")
@@ -58,6 +63,11 @@ class Settings(BaseSettings):
     hotline_api_url: Optional[str] = Field(None, env="HOTLINE_API_URL")
     warm_transfer_api_url: Optional[str] = Field(None, env="WARM_TRANSFER_API_URL")
     directory_api_url: Optional[str] = Field(None, env="DIRECTORY_API_URL")
+    directory_cache_ttl_seconds: int = Field(60, env="DIRECTORY_CACHE_TTL_SECONDS")
+    directory_cache_max_size: int = Field(256, env="DIRECTORY_CACHE_MAX_SIZE")
+    api_failure_threshold: int = Field(2, env="API_FAILURE_THRESHOLD")
+    api_failure_window_seconds: int = Field(10, env="API_FAILURE_WINDOW_SECONDS")
+    api_circuit_cooldown_seconds: int = Field(30, env="API_CIRCUIT_COOLDOWN_SECONDS")
     
     # Monitoring
     metrics_enabled: bool = Field(True, env="METRICS_ENABLED")
@@ -0,0 +1,16 @@
+"""
+Identifier generation for PsyAssist AI.
+"""
+
+import os
+import time
+
+
+def new_id() -> str:
+    """Generate a unique, time-sortable identifier.
+    
+    The identifier is 32 hex characters: a 48-bit millisecond timestamp
+    followed by 80 random bits, so identifiers sort by creation time.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    return (timestamp_ms.to_bytes(6, 'big') + os.urandom(10)).hex()
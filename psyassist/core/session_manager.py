@@ -3,14 +3,16 @@ Session management for PsyAssist AI.
 """
 
 import asyncio
+import heapq
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Optional, List
-from uuid import uuid4
+from typing import Dict, Optional, List, Set, Tuple
 
 from ..schemas.session import Session, SessionState, SessionUpdate
 from ..schemas.events import SessionEvent, EventType
 from ..config.settings import settings
+from .ids import new_id
+from .time_cache import time_cache
 
 
 logger = logging.getLogger(__name__)
@@ -21,69 +23,113 @@ class SessionManager:
     
     def __init__(self):
         self.sessions: Dict[str, Session] = {}
+        # IDs of sessions that are not closed, for O(1) stats
+        self._active_ids: Set[str] = set()
+        # Min-heap of (deadline, session_id); entries are re-checked when popped
+        self._expiry_heap: List[Tuple[datetime, str]] = []
         self._cleanup_task: Optional[asyncio.Task] = None
         self._start_cleanup_task()
     
     def _start_cleanup_task(self):
         """Start the background cleanup task."""
         if not self._cleanup_task or self._cleanup_task.done():
-            self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # No running loop, e.g. when psyassist.core is imported outside the server
+                logger.debug("No running event loop, session cleanup task not started")
+                return
+            self._cleanup_task = loop.create_task(self._cleanup_loop())
     
     async def _cleanup_loop(self):
         """Background task to clean up expired sessions."""
         while True:
             try:
                 await self._cleanup_expired_sessions()
-                await asyncio.sleep(settings.session_cleanup_interval_minutes * 60)
+                await asyncio.sleep(self._next_cleanup_delay())
             except Exception as e:
                 logger.error(f"Error in session cleanup loop: {e}")
                 await asyncio.sleep(60)  # Wait 1 minute before retrying
     
+    def _next_cleanup_delay(self) -> float:
+        """Seconds until the soonest scheduled expiry, capped by the cleanup interval."""
+        interval = settings.session_cleanup_interval_minutes * 60
+        if not self._expiry_heap:
+            return interval
+        
+        delay = (self._expiry_heap[0][0] - time_cache.now).total_seconds()
+        return min(max(delay, 0), interval)
+    
+    def _expiry_deadline(self, session: Session) -> datetime:
+        """Get the time at which a session is due for cleanup."""
+        if session.state == SessionState.CLOSE:
+            # Remove closed sessions after retention period
+            return session.updated_at + timedelta(days=settings.data_retention_days)
+        
+        # Sessions with too many messages are due immediately
+        if session.message_count > settings.max_messages_per_session:
+            return session.updated_at
+        
+        return session.updated_at + timedelta(minutes=settings.session_timeout_minutes)
+    
+    def _schedule_expiry(self, session: Session):
+        """Add a session to the expiry index."""
+        heapq.heappush(self._expiry_heap, (self._expiry_deadline(session), session.session_id))
+    
     async def _cleanup_expired_sessions(self):
         """Remove expired sessions."""
-        now = datetime.utcnow()
-        expired_sessions = []
-        
-        for session_id, session in self.sessions.items():
-            if session.state not in [SessionState.CLOSE]:
-                # Check if session has timed out
-                timeout_minutes = settings.session_timeout_minutes
-                if session.updated_at and (now - session.updated_at).total_seconds() > timeout_minutes * 60:
-                    expired_sessions.append(session_id)
-                # Check if session has too many messages
-                elif session.message_count > settings.max_messages_per_session:
-                    expired_sessions.append(session_id)
-            elif session.state == SessionState.CLOSE:
-                # Remove closed sessions after retention period
-                retention_days = settings.data_retention_days
-                if session.updated_at and (now - session.updated_at).days > retention_days:
-                    expired_sessions.append(session_id)
-        
-        for session_id in expired_sessions:
-            await self.close_session(session_id, "Session expired or exceeded limits")
-            logger.info(f"Cleaned up expired session: {session_id}")
+        now = time_cache.now
+        removed = set()
+        
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, session_id = heapq.heappop(self._expiry_heap)
+            session = self.sessions.get(session_id)
+            if not session or session_id in removed:
+                continue
+            
+            # Activity may have pushed the deadline back since this entry was queued
+            if self._expiry_deadline(session) > now:
+                self._schedule_expiry(session)
+                continue
+            
+            if session.state == SessionState.CLOSE:
+                removed.add(session_id)
+            else:
+                await self.close_session(session_id, "Session expired or exceeded limits")
+                self._schedule_expiry(session)
+                logger.info(f"Cleaned up expired session: {session_id}")
+        
+        if removed:
+            # Drop closed sessions past retention in a single pass
+            self.sessions = {
+                session_id: session for session_id, session in self.sessions.items()
+                if session_id not in removed
+            }
+            logger.info(f"Removed {len(removed)} closed sessions")
     
     async def create_session(self, user_id: Optional[str] = None) -> Session:
         """Create a new session."""
-        session_id = str(uuid4())
+        session_id = new_id()
         session = Session(
             session_id=session_id,
             user_id=user_id,
             state=SessionState.INIT,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
+            created_at=time_cache.now,
+            updated_at=time_cache.now,
             metadata={},
             message_count=0,
             risk_flags=[]
         )
         
         self.sessions[session_id] = session
+        self._active_ids.add(session_id)
+        self._schedule_expiry(session)
         
         # Add session creation event
         event = SessionEvent(
             session_id=session_id,
             event_type=EventType.SESSION_CREATED,
-            timestamp=datetime.utcnow(),
+            timestamp=time_cache.now,
             data={"user_id": user_id}
         )
         session.events.append(event)
@@ -96,7 +142,7 @@ class SessionManager:
         session = self.sessions.get(session_id)
         if session and session.state != SessionState.CLOSE:
             # Update last activity
-            session.updated_at = datetime.utcnow()
+            session.updated_at = time_cache.now
         return session
     
     async def update_session(self, session_id: str, **kwargs) -> Optional[Session]:
@@ -109,7 +155,12 @@ class SessionManager:
             if hasattr(session, key):
                 setattr(session, key, value)
         
-        session.updated_at = datetime.utcnow()
+        if session.state == SessionState.CLOSE:
+            self._active_ids.discard(session_id)
+        else:
+            self._active_ids.add(session_id)
+        
+        session.updated_at = time_cache.now
         return session
     
     async def add_message(self, session_id: str, message: dict) -> Optional[Session]:
@@ -119,7 +170,11 @@ class SessionManager:
             return None
         
         session.message_count += 1
-        session.updated_at = datetime.utcnow()
+        session.updated_at = time_cache.now
+        
+        # Queue sessions that just went over the message limit for cleanup
+        if session.message_count == settings.max_messages_per_session + 1:
+            self._schedule_expiry(session)
         
         # Note: Events are handled separately in the orchestrator
         pass
@@ -132,7 +187,7 @@ class SessionManager:
         if not session:
             return None
         
-        session.updated_at = datetime.utcnow()
+        session.updated_at = time_cache.now
         # Note: Events are handled separately in the orchestrator
         return session
     
@@ -143,7 +198,8 @@ class SessionManager:
             return None
         
         session.state = SessionState.CLOSE
-        session.updated_at = datetime.utcnow()
+        session.updated_at = time_cache.now
+        self._active_ids.discard(session_id)
         
         # Note: Events are handled separately in the orchestrator
         pass
@@ -153,16 +209,13 @@ class SessionManager:
     
     async def list_active_sessions(self) -> List[Session]:
         """Get all active sessions."""
-        return [
-            session for session in self.sessions.values()
-            if session.state != SessionState.CLOSE
-        ]
+        return [self.sessions[session_id] for session_id in self._active_ids]
     
     async def get_session_stats(self) -> dict:
         """Get session statistics."""
         total_sessions = len(self.sessions)
-        active_sessions = len([s for s in self.sessions.values() if s.state != SessionState.CLOSE])
-        closed_sessions = len([s for s in self.sessions.values() if s.state == SessionState.CLOSE])
+        active_sessions = len(self._active_ids)
+        closed_sessions = total_sessions - active_sessions
         
         return {
             "total_sessions": total_sessions,
@@ -183,10 +236,8 @@ class SessionManager:
                 pass
         
         # Close all active sessions
-        for session_id in list(self.sessions.keys()):
-            session = self.sessions[session_id]
-            if session.state != SessionState.CLOSE:
-                await self.close_session(session_id, "System shutdown")
+        for session_id in list(self._active_ids):
+            await self.close_session(session_id, "System shutdown")
         
         logger.info("Session manager cleaned up")
 
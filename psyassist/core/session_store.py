@@ -0,0 +1,122 @@
+"""
+Two-tier session storage for PsyAssist AI.
+"""
+
+import logging
+import shelve
+import weakref
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Callable, Iterator, Optional
+
+from ..schemas.session import Session
+
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore(MutableMapping):
+    """Session mapping with a bounded in-memory LRU tier in front of disk storage.
+    
+    Without a path every session stays in memory, like a plain dict. Sessions for
+    which pinned(session_id) is true, e.g. ones being processed, are never spilled.
+    
+    The disk tier is a shelve read and written synchronously by the caller, so in
+    the server a spill or a lookup that misses the hot tier blocks the event loop.
+    It is meant for development and tests; size the hot tier to hold the working
+    set of sessions when enabling it elsewhere.
+    """
+    
+    def __init__(self, path: Optional[str] = None, hot_size: int = 10000,
+                 pinned: Optional[Callable[[str], bool]] = None):
+        self.hot_size = hot_size
+        self.pinned = pinned
+        self.hot: OrderedDict = OrderedDict()
+        self.cold: Optional[shelve.Shelf] = shelve.open(path) if path else None
+        # Sessions on disk, counted once at open since len() of a shelf may scan the file
+        self._cold_count = len(self.cold) if self.cold is not None else 0
+        # Spilled sessions still referenced elsewhere, which are newer than their disk copy
+        self._spilled: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+    
+    def __getitem__(self, session_id: str) -> Session:
+        session = self.hot.get(session_id)
+        if session is not None:
+            self.hot.move_to_end(session_id)
+            return session
+        
+        if self.cold is None or session_id not in self.cold:
+            raise KeyError(session_id)
+        
+        # Promote the session back into memory, keeping the live object if one exists
+        stored = self.cold.pop(session_id)
+        self._cold_count -= 1
+        session = self._spilled.pop(session_id, stored)
+        self._put_hot(session_id, session)
+        return session
+    
+    def __setitem__(self, session_id: str, session: Session):
+        if self.cold is not None and session_id in self.cold:
+            del self.cold[session_id]
+            self._cold_count -= 1
+            self._spilled.pop(session_id, None)
+        self._put_hot(session_id, session)
+    
+    def __delitem__(self, session_id: str):
+        if session_id in self.hot:
+            del self.hot[session_id]
+        elif self.cold is not None and session_id in self.cold:
+            del self.cold[session_id]
+            self._cold_count -= 1
+            self._spilled.pop(session_id, None)
+        else:
+            raise KeyError(session_id)
+    
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self.hot or (self.cold is not None and session_id in self.cold)
+    
+    def __iter__(self) -> Iterator[str]:
+        yield from list(self.hot)
+        if self.cold is not None:
+            yield from list(self.cold.keys())
+    
+    def __len__(self) -> int:
+        return len(self.hot) + self._cold_count
+    
+    def _put_hot(self, session_id: str, session: Session):
+        """Insert a session into the hot tier, spilling the coldest one to disk."""
+        self.hot[session_id] = session
+        self.hot.move_to_end(session_id)
+        
+        if self.cold is not None and len(self.hot) > self.hot_size:
+            self._spill()
+    
+    def _spill(self):
+        """Move the least recently used unpinned session to disk."""
+        for evicted_id in self.hot:
+            if self.pinned is None or not self.pinned(evicted_id):
+                break
+        else:
+            # Every session is in use, so let the hot tier grow until one is released
+            return
+        
+        evicted = self.hot.pop(evicted_id)
+        self.cold[evicted_id] = evicted
+        self._cold_count += 1
+        self._spilled[evicted_id] = evicted
+    
+    def close(self):
+        """Write all sessions to disk and close the cold tier."""
+        if self.cold is None:
+            return
+        
+        while self.hot:
+            session_id, session = self.hot.popitem(last=False)
+            self.cold[session_id] = session
+        # Write back spilled sessions that may have changed since they were spilled
+        for session_id, session in list(self._spilled.items()):
+            self.cold[session_id] = session
+        self._spilled.clear()
+        self.cold.close()
+        self.cold = None
+        self._cold_count = 0
+        logger.info("Session store closed")
@@ -2,12 +2,15 @@
 State machine for PsyAssist AI session orchestration.
 """
 
-from typing import Dict, Any, Optional, Callable
-from datetime import datetime
+import time
+from functools import lru_cache
+from typing import Dict, Any, Optional, Callable, FrozenSet, Tuple
 from enum import Enum
 
-from ..schemas.session import Session, SessionState
+from ..schemas.session import Session, SessionState, StateTransitionRecord
 from ..schemas.events import EventType, EventPriority
+from ..schemas.risk import ELEVATED_SEVERITIES
+from .time_cache import time_cache
 from ..agents import (
     GreeterAgent, EmpathyAgent, TherapyGuideAgent, 
     RiskAssessmentAgent, ResourceAgent, EscalationAgent
@@ -26,6 +29,28 @@ class StateTransition(Enum):
     ANY_TO_CLOSE = "ANY_TO_CLOSE"
 
 
+# Valid target states for each session state
+VALID_TRANSITIONS: Dict[SessionState, FrozenSet[SessionState]] = {
+    SessionState.INIT: frozenset({SessionState.CONSENTED, SessionState.ESCALATE, SessionState.CLOSE}),
+    SessionState.CONSENTED: frozenset({SessionState.TRIAGE, SessionState.ESCALATE, SessionState.CLOSE}),
+    SessionState.TRIAGE: frozenset({SessionState.SUPPORT_LOOP, SessionState.ESCALATE, SessionState.CLOSE}),
+    SessionState.SUPPORT_LOOP: frozenset({SessionState.RISK_CHECK, SessionState.RESOURCES, SessionState.ESCALATE, SessionState.CLOSE}),
+    SessionState.RISK_CHECK: frozenset({SessionState.SUPPORT_LOOP, SessionState.ESCALATE, SessionState.CLOSE}),
+    SessionState.RESOURCES: frozenset({SessionState.SUPPORT_LOOP, SessionState.ESCALATE, SessionState.CLOSE}),
+    SessionState.ESCALATE: frozenset({SessionState.CLOSE}),
+    SessionState.CLOSE: frozenset()
+}
+
+
+@lru_cache(maxsize=None)
+def _available_transitions(state: SessionState) -> Tuple[str, ...]:
+    """Get the transition names available from a state."""
+    return tuple(
+        transition.value for transition in StateTransition
+        if transition.value.startswith('ANY_TO_') or state.value in transition.value
+    )
+
+
 class StateMachine:
     """State machine for managing PsyAssist AI session flow."""
     
@@ -42,6 +67,7 @@ class StateMachine:
         }
         
         self.transitions = self._build_transitions()
+        self._next_state_handlers = self._build_next_state_handlers()
     
     def _build_transitions(self) -> Dict[StateTransition, Callable]:
         """Build the transition rules."""
@@ -56,6 +82,18 @@ class StateMachine:
             StateTransition.ANY_TO_CLOSE: self._any_to_close
         }
     
+    def _build_next_state_handlers(self) -> Dict[SessionState, Callable]:
+        """Build the per-state next state handlers."""
+        return {
+            SessionState.INIT: self._next_from_init,
+            SessionState.CONSENTED: self._next_from_consented,
+            SessionState.TRIAGE: self._next_from_triage,
+            SessionState.SUPPORT_LOOP: self._next_from_support_loop,
+            SessionState.RISK_CHECK: self._next_from_risk_check,
+            SessionState.RESOURCES: self._next_from_resources,
+            SessionState.ESCALATE: self._next_from_escalate
+        }
+    
     async def process_message(self, session: Session, message: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Process a message through the state machine."""
         context = context or {}
@@ -66,7 +104,7 @@ class StateMachine:
             return {
                 'content': 'Session has ended.',
                 'agent': 'System',
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': time_cache.now_iso,
                 'metadata': {'session_ended': True}
             }
         
@@ -84,7 +122,6 @@ class StateMachine:
     
     async def _determine_next_state(self, session: Session, response: Dict[str, Any], context: Dict[str, Any]) -> Optional[SessionState]:
         """Determine the next state based on current state and response."""
-        current_state = session.state
         metadata = response.get('metadata', {})
         
         # Check for emergency escalation
@@ -96,41 +133,58 @@ class StateMachine:
             return SessionState.CLOSE
         
         # State-specific transitions
-        if current_state == SessionState.INIT:
-            if metadata.get('consent_granted'):
-                return SessionState.CONSENTED
-        
-        elif current_state == SessionState.CONSENTED:
-            if metadata.get('triage_completed'):
-                return SessionState.TRIAGE
-        
-        elif current_state == SessionState.TRIAGE:
-            if metadata.get('triage_completed'):
-                return SessionState.SUPPORT_LOOP
-        
-        elif current_state == SessionState.SUPPORT_LOOP:
-            # Check if risk assessment is needed
-            if self._should_trigger_risk_check(session, metadata):
-                return SessionState.RISK_CHECK
-            
-            # Check if resources are requested
-            if metadata.get('resources_requested'):
-                return SessionState.RESOURCES
-        
-        elif current_state == SessionState.RISK_CHECK:
-            # Return to support loop after risk assessment
-            return SessionState.SUPPORT_LOOP
+        handler = self._next_state_handlers.get(session.state)
+        if handler:
+            return handler(session, metadata)
         
-        elif current_state == SessionState.RESOURCES:
-            # Return to support loop after providing resources
+        return None  # Stay in current state
+    
+    def _next_from_init(self, session: Session, metadata: Dict[str, Any]) -> Optional[SessionState]:
+        """Determine the next state from INIT."""
+        if metadata.get('consent_granted'):
+            return SessionState.CONSENTED
+        return None
+    
+    def _next_from_consented(self, session: Session, metadata: Dict[str, Any]) -> Optional[SessionState]:
+        """Determine the next state from CONSENTED."""
+        if metadata.get('triage_completed'):
+            return SessionState.TRIAGE
+        return None
+    
+    def _next_from_triage(self, session: Session, metadata: Dict[str, Any]) -> Optional[SessionState]:
+        """Determine the next state from TRIAGE."""
+        if metadata.get('triage_completed'):
             return SessionState.SUPPORT_LOOP
+        return None
+    
+    def _next_from_support_loop(self, session: Session, metadata: Dict[str, Any]) -> Optional[SessionState]:
+        """Determine the next state from SUPPORT_LOOP."""
+        # Check if risk assessment is needed
+        if self._should_trigger_risk_check(session, metadata):
+            return SessionState.RISK_CHECK
         
-        elif current_state == SessionState.ESCALATE:
-            # Stay in escalation until transfer is complete
-            if metadata.get('transfer_completed'):
-                return SessionState.CLOSE
+        # Check if resources are requested
+        if metadata.get('resources_requested'):
+            return SessionState.RESOURCES
         
-        return None  # Stay in current state
+        return None
+    
+    def _next_from_risk_check(self, session: Session, metadata: Dict[str, Any]) -> Optional[SessionState]:
+        """Determine the next state from RISK_CHECK."""
+        # Return to support loop after risk assessment
+        return SessionState.SUPPORT_LOOP
+    
+    def _next_from_resources(self, session: Session, metadata: Dict[str, Any]) -> Optional[SessionState]:
+        """Determine the next state from RESOURCES."""
+        # Return to support loop after providing resources
+        return SessionState.SUPPORT_LOOP
+    
+    def _next_from_escalate(self, session: Session, metadata: Dict[str, Any]) -> Optional[SessionState]:
+        """Determine the next state from ESCALATE."""
+        # Stay in escalation until transfer is complete
+        if metadata.get('transfer_completed'):
+            return SessionState.CLOSE
+        return None
     
     def _should_trigger_risk_check(self, session: Session, metadata: Dict[str, Any]) -> bool:
         """Determine if a risk check should be triggered."""
@@ -143,7 +197,7 @@ class StateMachine:
             return True
         
         # Check if risk was detected in current response
-        if metadata.get('risk_level') in ['MEDIUM', 'HIGH', 'CRITICAL']:
+        if metadata.get('risk_level') in ELEVATED_SEVERITIES:
             return True
         
         return False
@@ -153,17 +207,16 @@ class StateMachine:
         old_state = session.state
         session.state = new_state
         
-        # Update session metadata
-        session.metadata['state_transitions'] = session.metadata.get('state_transitions', [])
-        session.metadata['state_transitions'].append({
-            'from_state': old_state.value,
-            'to_state': new_state.value,
-            'timestamp': datetime.utcnow().isoformat(),
-            'trigger': response.get('metadata', {})
-        })
+        # Record the transition
+        session.transitions.append(StateTransitionRecord(
+            from_state=old_state.value,
+            to_state=new_state.value,
+            timestamp_ns=time.time_ns(),
+            trigger_keys=tuple(response.get('metadata', {}))
+        ))
         
         # Update session
-        session.updated_at = datetime.utcnow()
+        session.updated_at = time_cache.now
     
     # Transition rule implementations
     def _init_to_consented(self, session: Session, context: Dict[str, Any]) -> bool:
@@ -204,28 +257,8 @@ class StateMachine:
     
     def get_available_transitions(self, session: Session) -> list:
         """Get available transitions from the current state."""
-        available = []
-        
-        for transition in StateTransition:
-            if transition.value.startswith('ANY_TO_'):
-                available.append(transition.value)
-            elif session.state.value in transition.value:
-                available.append(transition.value)
-        
-        return available
+        return list(_available_transitions(session.state))
     
     def validate_transition(self, from_state: SessionState, to_state: SessionState) -> bool:
         """Validate if a state transition is allowed."""
-        # Define valid transitions
-        valid_transitions = {
-            SessionState.INIT: [SessionState.CONSENTED, SessionState.ESCALATE, SessionState.CLOSE],
-            SessionState.CONSENTED: [SessionState.TRIAGE, SessionState.ESCALATE, SessionState.CLOSE],
-            SessionState.TRIAGE: [SessionState.SUPPORT_LOOP, SessionState.ESCALATE, SessionState.CLOSE],
-            SessionState.SUPPORT_LOOP: [SessionState.RISK_CHECK, SessionState.RESOURCES, SessionState.ESCALATE, SessionState.CLOSE],
-            SessionState.RISK_CHECK: [SessionState.SUPPORT_LOOP, SessionState.ESCALATE, SessionState.CLOSE],
-            SessionState.RESOURCES: [SessionState.SUPPORT_LOOP, SessionState.ESCALATE, SessionState.CLOSE],
-            SessionState.ESCALATE: [SessionState.CLOSE],
-            SessionState.CLOSE: []
-        }
-        
-        return to_state in valid_transitions.get(from_state, [])
+        return to_state in VALID_TRANSITIONS.get(from_state, frozenset())
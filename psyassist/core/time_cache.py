@@ -0,0 +1,47 @@
+"""
+Per-tick UTC time cache for PsyAssist AI.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+
+class TimeCache:
+    """Caches the current UTC time for the duration of one event loop tick."""
+
+    def __init__(self):
+        self._now: Optional[datetime] = None
+        self._now_iso: Optional[str] = None
+
+    @property
+    def now(self) -> datetime:
+        """Get the current UTC time, shared by all callers within a tick."""
+        if self._now is None:
+            now = datetime.utcnow()
+            try:
+                asyncio.get_running_loop().call_soon(self._invalidate)
+            except RuntimeError:
+                # No running loop to invalidate the cache, so don't keep it
+                return now
+            self._now = now
+        return self._now
+
+    @property
+    def now_iso(self) -> str:
+        """Get the current UTC time as an ISO 8601 string."""
+        now = self.now
+        if self._now is None:
+            return now.isoformat()
+        if self._now_iso is None:
+            self._now_iso = now.isoformat()
+        return self._now_iso
+
+    def _invalidate(self):
+        """Drop the cached time at the end of the tick."""
+        self._now = None
+        self._now_iso = None
+
+
+# Global time cache instance
+time_cache = TimeCache()
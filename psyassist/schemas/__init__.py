@@ -6,3 +6,4 @@ from .session import *
 from .events import *
 from .risk import *
 from .resources import *
+from ._json import json_schema_for
@@ -0,0 +1,15 @@
+"""
+Enum helpers for PsyAssist AI schemas.
+"""
+
+
+class ValueLookup:
+    """Mixin adding a direct value-to-member lookup to an Enum."""
+    
+    @classmethod
+    def from_value(cls, value):
+        """Get the member for a value without going through the Enum constructor."""
+        try:
+            return cls._value2member_map_[value]
+        except KeyError:
+            raise ValueError(f"{value!r} is not a valid {cls.__name__}") from None
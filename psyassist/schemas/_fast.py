@@ -0,0 +1,26 @@
+"""
+Lightweight event records for the PsyAssist AI event pipeline.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from .events import EventType, EventPriority
+
+
+@dataclass(slots=True)
+class FastEvent:
+    """Slotted, unvalidated counterpart of BaseEvent used by the emitter.
+    
+    Producers fill these directly; pydantic-core serializes them like the
+    model, so a full BaseEvent is only needed when one is validated.
+    """
+    event_id: str
+    event_type: EventType
+    session_id: str
+    timestamp: datetime
+    priority: EventPriority
+    source: str
+    user_id: Optional[str]
+    metadata: Dict[str, Any]
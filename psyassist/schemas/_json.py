@@ -0,0 +1,29 @@
+"""
+JSON helpers for PsyAssist AI schemas, backed by pydantic-core.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Type, Union
+
+from pydantic import BaseModel
+from pydantic_core import from_json, to_json
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize models, dataclasses and plain data straight to JSON bytes."""
+    return to_json(obj)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON text or bytes."""
+    return from_json(data)
+
+
+@lru_cache(maxsize=None)
+def json_schema_for(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Get the JSON schema of a model, built once per model class.
+    
+    Callers must not mutate the returned schema. Call
+    json_schema_for.cache_clear() after reloading schema modules.
+    """
+    return model.model_json_schema()
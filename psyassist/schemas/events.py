@@ -2,16 +2,22 @@
 Event schemas for PsyAssist AI observability system.
 """
 
-from enum import Enum
-from typing import Dict, Any, Optional, List
-from datetime import datetime
-from pydantic import BaseModel, Field, validator
+import sys
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum
+from typing import Annotated, Dict, Any, Iterator, Optional, List, Literal, Union
+from datetime import datetime, timedelta, timezone
+from pydantic import BaseModel, Field, computed_field, field_validator
 
+from ._enum import ValueLookup
+from ._json import dumps
 from .session import SessionState, ConsentStatus
 from .risk import RiskSeverity, RiskCategory
 
 
-class EventType(str, Enum):
+class EventType(ValueLookup, str, Enum):
     """Types of events that can be emitted."""
     # Session events
     SESSION_CREATED = "session.created"
@@ -54,6 +60,12 @@ class EventType(str, Enum):
     SYSTEM_INFO = "system.info"
 
 
+# Register event type values in the interned string table
+for _event_type in EventType:
+    sys.intern(_event_type.value)
+del _event_type
+
+
 class EventPriority(str, Enum):
     """Event priority levels."""
     LOW = "LOW"
@@ -62,6 +74,23 @@ class EventPriority(str, Enum):
     CRITICAL = "CRITICAL"
 
 
+# Integer event type IDs for in-process routing, one per EventType member
+EventTypeId = IntEnum('EventTypeId', [(member.name, code) for code, member in enumerate(EventType)])
+
+# Bijection between wire event types and their integer IDs
+EVENT_TYPE_IDS: Dict[EventType, EventTypeId] = {member: EventTypeId[member.name] for member in EventType}
+EVENT_TYPES_BY_ID: Dict[EventTypeId, EventType] = {type_id: member for member, type_id in EVENT_TYPE_IDS.items()}
+
+# Compact integer codes for priorities in columnar batches
+EVENT_PRIORITY_CODES: Dict[EventPriority, int] = {member: code for code, member in enumerate(EventPriority)}
+_EVENT_TYPES = tuple(EventType)
+_EVENT_PRIORITIES = tuple(EventPriority)
+
+# Reference point for integer timestamps in columnar batches; naive timestamps are UTC
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
 class BaseEvent(BaseModel):
     """Base event model."""
     event_id: str = Field(..., description="Unique event identifier")
@@ -75,14 +104,23 @@ class BaseEvent(BaseModel):
     user_id: Optional[str] = Field(None, description="User ID if available")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional event metadata")
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    @field_validator('session_id', 'source', 'user_id')
+    @classmethod
+    def intern_identifiers(cls, v):
+        # Identifiers repeat across events, so share one string object per value
+        return sys.intern(v) if v else v
+    
+    def to_json(self) -> bytes:
+        """Serialize the event to JSON bytes."""
+        return dumps(self)
 
 
 class SessionEvent(BaseEvent):
     """Session-related events."""
+    event_type: Literal[
+        EventType.SESSION_CREATED, EventType.SESSION_UPDATED, EventType.SESSION_CLOSED, EventType.SESSION_EXPIRED,
+        EventType.CONSENT_GRANTED, EventType.CONSENT_DENIED, EventType.CONSENT_WITHDRAWN
+    ] = Field(..., description="Type of event")
     old_state: Optional[SessionState] = Field(None, description="Previous session state")
     new_state: Optional[SessionState] = Field(None, description="New session state")
     consent_status: Optional[ConsentStatus] = Field(None, description="Consent status")
@@ -92,6 +130,9 @@ class SessionEvent(BaseEvent):
 
 class RiskEvent(BaseEvent):
     """Risk assessment events."""
+    event_type: Literal[
+        EventType.RISK_ASSESSED, EventType.RISK_FLAG_RAISED, EventType.RISK_ESCALATION_TRIGGERED
+    ] = Field(..., description="Type of event")
     risk_severity: Optional[RiskSeverity] = Field(None, description="Risk severity level")
     risk_categories: List[RiskCategory] = Field(default_factory=list, description="Risk categories")
     confidence: Optional[float] = Field(None, ge=0.0, le=1.0, description="Assessment confidence")
@@ -101,15 +142,21 @@ class RiskEvent(BaseEvent):
 
 class MessageEvent(BaseEvent):
     """Message-related events."""
-    message_id: str = Field(..., description="Message identifier")
-    message_type: str = Field(..., description="Type of message (user/agent)")
-    content_length: int = Field(..., description="Length of message content")
+    event_type: Literal[
+        EventType.MESSAGE_RECEIVED, EventType.MESSAGE_SENT, EventType.MESSAGE_PROCESSED
+    ] = Field(..., description="Type of event")
+    message_id: Optional[str] = Field(None, description="Message identifier")
+    message_type: Optional[str] = Field(None, description="Type of message (user/agent)")
+    content_length: Optional[int] = Field(None, description="Length of message content")
     processing_time_ms: Optional[float] = Field(None, description="Message processing time")
     agent_involved: Optional[str] = Field(None, description="Agent that processed the message")
 
 
 class AgentEvent(BaseEvent):
     """Agent-related events."""
+    event_type: Literal[
+        EventType.AGENT_ACTIVATED, EventType.AGENT_COMPLETED, EventType.AGENT_ERROR
+    ] = Field(..., description="Type of event")
     agent_name: str = Field(..., description="Name of the agent")
     task_type: str = Field(..., description="Type of task performed")
     task_duration_ms: Optional[float] = Field(None, description="Task duration")
@@ -117,10 +164,21 @@ class AgentEvent(BaseEvent):
     error_message: Optional[str] = Field(None, description="Error message if failed")
 
 
+class ResourceEvent(BaseEvent):
+    """Resource-related events."""
+    event_type: Literal[
+        EventType.RESOURCE_PROVIDED, EventType.RESOURCE_ACCESSED
+    ] = Field(..., description="Type of event")
+    resource_id: Optional[str] = Field(None, description="Resource identifier")
+
+
 class EscalationEvent(BaseEvent):
     """Escalation-related events."""
-    escalation_type: str = Field(..., description="Type of escalation")
-    target_service: str = Field(..., description="Target service for escalation")
+    event_type: Literal[
+        EventType.ESCALATION_INITIATED, EventType.ESCALATION_COMPLETED, EventType.ESCALATION_FAILED
+    ] = Field(..., description="Type of event")
+    escalation_type: Optional[str] = Field(None, description="Type of escalation")
+    target_service: Optional[str] = Field(None, description="Target service for escalation")
     contact_info: Optional[str] = Field(None, description="Contact information provided")
     success: bool = Field(True, description="Whether escalation was successful")
     response_time_ms: Optional[float] = Field(None, description="Response time from target service")
@@ -128,26 +186,111 @@ class EscalationEvent(BaseEvent):
 
 class SystemEvent(BaseEvent):
     """System-related events."""
+    event_type: Literal[
+        EventType.SYSTEM_ERROR, EventType.SYSTEM_WARNING, EventType.SYSTEM_INFO
+    ] = Field(..., description="Type of event")
     component: str = Field(..., description="System component")
     error_code: Optional[str] = Field(None, description="Error code if applicable")
     error_details: Optional[str] = Field(None, description="Detailed error information")
     stack_trace: Optional[str] = Field(None, description="Stack trace for errors")
 
 
+# Any concrete event, dispatched on its event type
+Event = Annotated[
+    Union[SessionEvent, RiskEvent, MessageEvent, AgentEvent, ResourceEvent, EscalationEvent, SystemEvent],
+    Field(discriminator='event_type')
+]
+
+
 class EventBatch(BaseModel):
     """Batch of events for efficient processing."""
     batch_id: str = Field(..., description="Unique batch identifier")
-    events: List[BaseEvent] = Field(..., description="List of events in the batch")
-    batch_size: int = Field(..., description="Number of events in batch")
+    events: List[Event] = Field(..., description="List of events in the batch")
     created_at: datetime = Field(default_factory=datetime.utcnow, description="Batch creation time")
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    @computed_field
+    @property
+    def batch_size(self) -> int:
+        """Number of events in batch."""
+        return len(self.events)
+    
+    def to_json(self) -> bytes:
+        """Serialize the batch to JSON bytes."""
+        return dumps(self)
+    
+    def iter_ndjson(self) -> Iterator[bytes]:
+        """Serialize the batch as newline-delimited JSON, one event per line.
+        
+        The first line holds the batch header. Only one event is encoded at a
+        time, so large batches can be streamed without building the full payload.
+        """
+        yield dumps({
+            'batch_id': self.batch_id,
+            'batch_size': self.batch_size,
+            'created_at': self.created_at
+        }) + b"\n"
+        for event in self.events:
+            yield dumps(event) + b"\n"
+
+
+@dataclass(slots=True)
+class EventBatchColumnar:
+    """Column-oriented view of a batch of events for analytics.
+    
+    Enum fields are stored as compact integer codes and timestamps as
+    microseconds since the Unix epoch, each in a typed array. Only the
+    BaseEvent fields are kept, so fields of event subclasses are dropped.
+    """
+    event_ids: List[str] = field(default_factory=list)
+    session_ids: List[str] = field(default_factory=list)
+    sources: List[str] = field(default_factory=list)
+    user_ids: List[Optional[str]] = field(default_factory=list)
+    metadata: List[Dict[str, Any]] = field(default_factory=list)
+    event_types: array = field(default_factory=lambda: array('B'))
+    priorities: array = field(default_factory=lambda: array('B'))
+    timestamps_us: array = field(default_factory=lambda: array('q'))
+    
+    @classmethod
+    def from_events(cls, events: List[BaseEvent]) -> "EventBatchColumnar":
+        """Build the columns from a list of events in a single pass."""
+        columns = cls()
+        for event in events:
+            columns.event_ids.append(event.event_id)
+            columns.session_ids.append(event.session_id)
+            columns.sources.append(event.source)
+            columns.user_ids.append(event.user_id)
+            columns.metadata.append(event.metadata)
+            columns.event_types.append(EVENT_TYPE_IDS[event.event_type])
+            columns.priorities.append(EVENT_PRIORITY_CODES[event.priority])
+            timestamp = event.timestamp
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.replace(tzinfo=timezone.utc)
+            columns.timestamps_us.append((timestamp - _EPOCH) // _MICROSECOND)
+        return columns
+    
+    def to_events(self) -> List[BaseEvent]:
+        """Rebuild the events from the columns as BaseEvents with UTC timestamps."""
+        return [
+            BaseEvent.model_construct(
+                event_id=event_id,
+                event_type=_EVENT_TYPES[event_type],
+                session_id=session_id,
+                timestamp=_EPOCH + timestamp_us * _MICROSECOND,
+                priority=_EVENT_PRIORITIES[priority],
+                source=source,
+                user_id=user_id,
+                metadata=metadata
+            )
+            for event_id, event_type, session_id, timestamp_us, priority, source, user_id, metadata in zip(
+                self.event_ids, self.event_types, self.session_ids, self.timestamps_us,
+                self.priorities, self.sources, self.user_ids, self.metadata
+            )
+        ]
+    
+    def event_type_counts(self) -> Dict[EventType, int]:
+        """Count events per event type."""
+        return {_EVENT_TYPES[code]: count for code, count in Counter(self.event_types).items()}
     
-    @validator('batch_size')
-    def validate_batch_size(cls, v, values):
-        if 'events' in values and v != len(values['events']):
-            raise ValueError("Batch size must match number of events")
-        return v
+    def priority_counts(self) -> Dict[EventPriority, int]:
+        """Count events per priority."""
+        return {_EVENT_PRIORITIES[code]: count for code, count in Counter(self.priorities).items()}
@@ -2,10 +2,37 @@
 Resource schemas for PsyAssist AI support system.
 """
 
+import re
 from enum import Enum
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
+
+
+# Matcher for basic phone number validation
+_PHONE_RE = re.compile(r'^\+?[\d\s\-\(\)]+$').match
+
+
+class _ResourceIndex:
+    """Positions of resources in a list by ID, built on first lookup.
+    
+    Hits are checked against the list and a miss rebuilds the index, so lookups
+    stay correct when the list is mutated or reassigned.
+    """
+    __slots__ = ('_positions',)
+    
+    def __init__(self):
+        self._positions: Dict[str, int] = {}
+    
+    def get(self, resources: List["Resource"], resource_id: str) -> Optional["Resource"]:
+        """Get a resource from the list by ID."""
+        position = self._positions.get(resource_id)
+        if position is None or position >= len(resources) or resources[position].resource_id != resource_id:
+            self._positions = {resource.resource_id: i for i, resource in enumerate(resources)}
+            position = self._positions.get(resource_id)
+            if position is None:
+                return None
+        return resources[position]
 
 
 class ResourceType(str, Enum):
@@ -29,6 +56,14 @@ class ResourceCategory(str, Enum):
     GENERAL_SUPPORT = "GENERAL_SUPPORT"
 
 
+# Category sets requested together by resource lookups
+CRISIS_CATEGORIES = frozenset({
+    ResourceCategory.SUICIDE_PREVENTION.value,
+    ResourceCategory.CRISIS_INTERVENTION.value
+})
+MENTAL_HEALTH_CATEGORIES = frozenset({ResourceCategory.MENTAL_HEALTH.value})
+
+
 class Availability(str, Enum):
     """Resource availability status."""
     AVAILABLE = "AVAILABLE"
@@ -82,19 +117,11 @@ class Resource(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.utcnow, description="Last update time")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-    
-    @validator('phone_number', 'text_number')
+    @field_validator('phone_number', 'text_number')
+    @classmethod
     def validate_phone_format(cls, v):
-        if v is not None:
-            # Basic phone number validation
-            import re
-            phone_pattern = r'^\+?[\d\s\-\(\)]+$'
-            if not re.match(phone_pattern, v):
-                raise ValueError("Invalid phone number format")
+        if v is not None and not _PHONE_RE(v):
+            raise ValueError("Invalid phone number format")
         return v
 
 
@@ -117,16 +144,18 @@ class ResourceBundle(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow, description="Bundle creation time")
     active: bool = Field(True, description="Whether bundle is active")
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-    
-    @validator('resources')
+    @field_validator('resources')
+    @classmethod
     def validate_resources(cls, v):
         if not v:
             raise ValueError("Resource bundle must contain at least one resource")
         return v
+    
+    _index: _ResourceIndex = PrivateAttr(default_factory=_ResourceIndex)
+    
+    def get(self, resource_id: str) -> Optional[Resource]:
+        """Get a resource by ID."""
+        return self._index.get(self.resources, resource_id)
 
 
 class EscalationPlan(BaseModel):
@@ -156,10 +185,11 @@ class EscalationPlan(BaseModel):
     instructions: List[str] = Field(default_factory=list, description="Instructions for escalation")
     safety_notes: Optional[str] = Field(None, description="Safety-related notes")
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    _index: _ResourceIndex = PrivateAttr(default_factory=_ResourceIndex)
+    
+    def get_backup(self, resource_id: str) -> Optional[Resource]:
+        """Get a backup resource by ID."""
+        return self._index.get(self.backup_resources, resource_id)
 
 
 class ResourceDirectory(BaseModel):
@@ -177,7 +207,8 @@ class ResourceDirectory(BaseModel):
     source: str = Field(..., description="Data source")
     coverage_regions: List[str] = Field(default_factory=list, description="Covered regions")
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    _index: _ResourceIndex = PrivateAttr(default_factory=_ResourceIndex)
+    
+    def get(self, resource_id: str) -> Optional[Resource]:
+        """Get a resource by ID."""
+        return self._index.get(self.resources, resource_id)
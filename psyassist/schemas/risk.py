@@ -2,13 +2,16 @@
 Risk assessment schemas for PsyAssist AI safety system.
 """
 
+import re
 from enum import Enum
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Pattern, Tuple
 from datetime import datetime
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
 
+from ._enum import ValueLookup
 
-class RiskSeverity(str, Enum):
+
+class RiskSeverity(ValueLookup, str, Enum):
     """Risk severity levels."""
     NONE = "NONE"
     LOW = "LOW"
@@ -17,7 +20,18 @@ class RiskSeverity(str, Enum):
     CRITICAL = "CRITICAL"
 
 
-class RiskCategory(str, Enum):
+# Numeric rank of each severity level, lowest first
+SEVERITY_ORDER: Dict[RiskSeverity, int] = {severity: rank for rank, severity in enumerate(RiskSeverity)}
+SEVERITY_BY_RANK = tuple(RiskSeverity)
+
+# Severities that raise a session risk flag
+ELEVATED_SEVERITIES = frozenset({RiskSeverity.MEDIUM, RiskSeverity.HIGH, RiskSeverity.CRITICAL})
+
+# Severities that are handled with high priority
+URGENT_SEVERITIES = frozenset({RiskSeverity.HIGH, RiskSeverity.CRITICAL})
+
+
+class RiskCategory(ValueLookup, str, Enum):
     """Categories of risk factors."""
     SUICIDE = "SUICIDE"
     SELF_HARM = "SELF_HARM"
@@ -61,30 +75,14 @@ class RiskAssessment(BaseModel):
     escalation_triggered: bool = Field(False, description="Whether escalation was triggered")
     emergency_contact_provided: bool = Field(False, description="Whether emergency contact was provided")
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-    
-    @validator('overall_severity')
-    def validate_overall_severity(cls, v, values):
+    @model_validator(mode='after')
+    def validate_overall_severity(self):
         """Ensure overall severity reflects the highest individual factor severity."""
-        if 'risk_factors' in values:
-            max_factor_severity = max(
-                (factor.severity for factor in values['risk_factors']),
-                default=RiskSeverity.NONE
-            )
-            # Map severity levels to numeric values for comparison
-            severity_order = {
-                RiskSeverity.NONE: 0,
-                RiskSeverity.LOW: 1,
-                RiskSeverity.MEDIUM: 2,
-                RiskSeverity.HIGH: 3,
-                RiskSeverity.CRITICAL: 4
-            }
-            if severity_order[v] < severity_order[max_factor_severity]:
-                raise ValueError(f"Overall severity {v} cannot be lower than highest factor severity {max_factor_severity}")
-        return v
+        v = self.overall_severity
+        max_rank = max((SEVERITY_ORDER[factor.severity] for factor in self.risk_factors), default=0)
+        if SEVERITY_ORDER[v] < max_rank:
+            raise ValueError(f"Overall severity {v} cannot be lower than highest factor severity {SEVERITY_BY_RANK[max_rank]}")
+        return self
 
 
 class RiskThreshold(BaseModel):
@@ -126,3 +124,58 @@ class RiskKeywords(BaseModel):
         "immediate_risk": r"(right now|tonight|today|immediately).*(kill|die|suicide|harm)",
         "means_available": r"(gun|pills|rope|knife|weapon).*(have|got|access)",
     })
+    
+    _matcher: Pattern = PrivateAttr()
+    _keyword_hits: Dict[str, List[Tuple[str, str]]] = PrivateAttr()
+    _compiled_patterns: Dict[str, Pattern] = PrivateAttr()
+    
+    def model_post_init(self, __context: Any):
+        """Compile all keyword lists into one matcher and precompile the patterns."""
+        category_keywords = {
+            'suicide': self.suicide_keywords,
+            'self_harm': self.self_harm_keywords,
+            'harm_to_others': self.harm_to_others_keywords,
+            'crisis': self.crisis_keywords,
+        }
+        
+        # Map each lowercased keyword to the (category, keyword) pairs it stands for
+        hits: Dict[str, List[Tuple[str, str]]] = {}
+        for category, keywords in category_keywords.items():
+            for keyword in keywords:
+                hits.setdefault(keyword.lower(), []).append((category, keyword))
+        
+        # Only the longest keyword starting at a position is matched, so it
+        # also reports the shorter keywords it starts with
+        self._keyword_hits = {
+            word: [hit for other in hits if word.startswith(other) for hit in hits[other]]
+            for word in hits
+        }
+        
+        # A lookahead finds keywords at every position, including overlapping ones
+        alternatives = '|'.join(re.escape(word) for word in sorted(hits, key=len, reverse=True))
+        self._matcher = re.compile(f'(?=({alternatives}))')
+        
+        self._compiled_patterns = {
+            name: re.compile(pattern, re.IGNORECASE) for name, pattern in self.patterns.items()
+        }
+    
+    @property
+    def compiled_patterns(self) -> Dict[str, Pattern]:
+        """Get the complex detection patterns, compiled once."""
+        return self._compiled_patterns
+    
+    def search(self, text: str) -> Dict[str, bool]:
+        """Check which complex detection patterns match the text."""
+        return {name: pattern.search(text) is not None for name, pattern in self._compiled_patterns.items()}
+    
+    def scan(self, text: str) -> List[Tuple[str, str]]:
+        """Find keywords in text in a single pass.
+        
+        Returns (category, keyword) pairs for every keyword contained in the
+        text, each reported once in order of first occurrence.
+        """
+        found = {}
+        for match in self._matcher.finditer(text.lower()):
+            for hit in self._keyword_hits[match.group(1)]:
+                found.setdefault(hit, None)
+        return list(found)
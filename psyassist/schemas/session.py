@@ -2,13 +2,46 @@
 Session management schemas for PsyAssist AI.
 """
 
+from collections import ChainMap, deque
+from collections.abc import Mapping
+from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Dict, Any, List
+from typing import Annotated, Optional, Dict, Any, List, Tuple, Deque
 from datetime import datetime
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, PlainSerializer, PlainValidator, WithJsonSchema, field_validator
 
+from ._enum import ValueLookup
 
-class SessionState(str, Enum):
+
+# Number of most recent risk flags kept per session
+RISK_FLAG_WINDOW = 16
+
+# Number of metadata layers kept before they are collapsed into one
+METADATA_MAX_LAYERS = 8
+
+# Keys that must never be stored in session metadata
+SENSITIVE_METADATA_KEYS = frozenset(('ssn', 'credit_card', 'password', 'token'))
+
+
+def _as_chain_map(value: Any) -> ChainMap:
+    """Wrap plain metadata in a single-layer ChainMap."""
+    if isinstance(value, ChainMap):
+        return value
+    if not isinstance(value, Mapping):
+        raise ValueError("metadata must be a mapping")
+    return ChainMap(dict(value))
+
+
+# Layered at runtime, but validated, serialized and documented as a plain JSON object
+MetadataLayers = Annotated[
+    ChainMap,
+    PlainValidator(_as_chain_map),
+    PlainSerializer(dict, return_type=Dict[str, Any]),
+    WithJsonSchema({'type': 'object', 'additionalProperties': True}),
+]
+
+
+class SessionState(ValueLookup, str, Enum):
     """Session state enumeration."""
     INIT = "INIT"
     CONSENTED = "CONSENTED"
@@ -20,7 +53,7 @@ class SessionState(str, Enum):
     CLOSE = "CLOSE"
 
 
-class ConsentStatus(str, Enum):
+class ConsentStatus(ValueLookup, str, Enum):
     """User consent status."""
     PENDING = "PENDING"
     GRANTED = "GRANTED"
@@ -28,6 +61,15 @@ class ConsentStatus(str, Enum):
     WITHDRAWN = "WITHDRAWN"
 
 
+@dataclass(slots=True, frozen=True)
+class StateTransitionRecord:
+    """Record of a single session state transition."""
+    from_state: str
+    to_state: str
+    timestamp_ns: int
+    trigger_keys: Tuple[str, ...] = ()
+
+
 class Session(BaseModel):
     """Session model for tracking user interactions."""
     session_id: str = Field(..., description="Unique session identifier")
@@ -41,35 +83,57 @@ class Session(BaseModel):
     expires_at: Optional[datetime] = Field(None, description="Session expiration time")
     
     # Session data
-    metadata: Dict[str, Any] = Field(default_factory=dict, description="Session metadata")
+    metadata: MetadataLayers = Field(default_factory=ChainMap, description="Session metadata, newest layer first")
     message_count: int = Field(0, description="Number of messages exchanged")
-    risk_flags: List[str] = Field(default_factory=list, description="Risk flags raised during session")
+    risk_flags: Deque[str] = Field(
+        default_factory=lambda: deque(maxlen=RISK_FLAG_WINDOW),
+        description="Most recent risk flags raised during session"
+    )
+    transitions: List[StateTransitionRecord] = Field(default_factory=list, description="State transition history")
     
     # Safety and limits
     max_messages: int = Field(50, description="Maximum messages per session")
     timeout_minutes: int = Field(30, description="Session timeout in minutes")
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    # Session is mutated several times per turn, so skip validation on assignment
+    model_config = ConfigDict(
+        validate_assignment=False,
+        extra='ignore'
+    )
+    
+    @field_validator('risk_flags')
+    @classmethod
+    def validate_risk_flags(cls, v):
+        # Keep only the most recent flags
+        if v.maxlen != RISK_FLAG_WINDOW:
+            return deque(v, maxlen=RISK_FLAG_WINDOW)
+        return v
+    
+    def push_metadata(self, layer: Dict[str, Any]):
+        """Layer new metadata over the existing session metadata."""
+        self.metadata.maps.insert(0, dict(layer))
+        
+        # Collapse layers periodically to keep lookups shallow
+        if len(self.metadata.maps) > METADATA_MAX_LAYERS:
+            self.metadata = ChainMap(dict(self.metadata))
 
 
 class SessionUpdate(BaseModel):
     """Model for updating session state."""
+    model_config = ConfigDict(validate_assignment=False, extra='ignore')
+    
     state: Optional[SessionState] = None
     consent_status: Optional[ConsentStatus] = None
     metadata: Optional[Dict[str, Any]] = None
     risk_flags: Optional[List[str]] = None
     
-    @validator('metadata')
+    @field_validator('metadata')
+    @classmethod
     def validate_metadata(cls, v):
-        if v is not None:
-            # Ensure no sensitive data in metadata
-            sensitive_keys = ['ssn', 'credit_card', 'password', 'token']
-            for key in sensitive_keys:
-                if key in v:
-                    raise ValueError(f"Sensitive key '{key}' not allowed in metadata")
+        # Ensure no sensitive data in metadata
+        if v and not SENSITIVE_METADATA_KEYS.isdisjoint(v):
+            keys = sorted(SENSITIVE_METADATA_KEYS.intersection(v))
+            raise ValueError(f"Sensitive keys {keys} not allowed in metadata")
         return v
 
 
@@ -84,8 +148,3 @@ class SessionSummary(BaseModel):
     escalated: bool
     created_at: datetime
     closed_at: Optional[datetime] = None
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
@@ -2,16 +2,32 @@
 Tool adapters for PsyAssist AI.
 """
 
-from .risk_classifier import RiskClassifier
-from .hotline_router import HotlineRouter
-from .warm_transfer import WarmTransferAPI
-from .directory_lookup import DirectoryLookup
-from .pii_redactor import PIIRedactor
+import importlib
+
+# Tools are imported on first access, mapped as name -> (module, attribute)
+_LAZY = {
+    "RiskClassifier": ("risk_classifier", "RiskClassifier"),
+    "HotlineRouter": ("hotline_router", "HotlineRouter"),
+    "WarmTransferAPI": ("warm_transfer", "WarmTransferAPI"),
+    "DirectoryLookup": ("directory_lookup", "DirectoryLookup"),
+    "PIIRedactor": ("pii_redactor", "PIIRedactor"),
+}
 
 __all__ = [
     "RiskClassifier",
-    "HotlineRouter", 
+    "HotlineRouter",
     "WarmTransferAPI",
     "DirectoryLookup",
     "PIIRedactor"
 ]
+
+
+def __getattr__(name):
+    """Import a tool the first time it is accessed."""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    module_name, attr = _LAZY[name]
+    value = getattr(importlib.import_module(f".{module_name}", __name__), attr)
+    globals()[name] = value
+    return value
@@ -0,0 +1,50 @@
+"""
+Circuit breaker for external API calls in PsyAssist AI.
+"""
+
+import logging
+import time
+
+from ..config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Skips calls to an external API for a while after repeated failures.
+    
+    Once enough consecutive failures happen within the failure window, the
+    circuit opens and callers go straight to their fallback until it cools down.
+    """
+    
+    def __init__(self, name: str, threshold: int = None, window_seconds: float = None, cooldown_seconds: float = None):
+        self.name = name
+        self.threshold = threshold or settings.api_failure_threshold
+        self.window_seconds = window_seconds or settings.api_failure_window_seconds
+        self.cooldown_seconds = cooldown_seconds or settings.api_circuit_cooldown_seconds
+        self._failures = 0
+        self._last_failure = 0.0
+        self._open_until = 0.0
+    
+    @property
+    def is_open(self) -> bool:
+        """Whether calls should skip the API."""
+        return time.monotonic() < self._open_until
+    
+    def record_success(self):
+        """Reset the failure count after a successful call."""
+        self._failures = 0
+    
+    def record_failure(self):
+        """Count a failed call, opening the circuit at the threshold."""
+        now = time.monotonic()
+        if now - self._last_failure > self.window_seconds:
+            self._failures = 0
+        self._failures += 1
+        self._last_failure = now
+        
+        if self._failures >= self.threshold:
+            self._open_until = now + self.cooldown_seconds
+            self._failures = 0
+            logger.warning(f"{self.name} API failing, using fallback for {self.cooldown_seconds}s")
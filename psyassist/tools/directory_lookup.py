@@ -3,20 +3,45 @@ Directory lookup tool for PsyAssist AI.
 """
 
 import asyncio
+import re
+import time
 import aiohttp
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Collection, List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 from abc import ABC, abstractmethod
+from pydantic import TypeAdapter
 
-from ..schemas.resources import Resource, ResourceDirectory, ResourceBundle, ResourceCategory
+from ..schemas.resources import (
+    Resource, ResourceDirectory, ResourceBundle, ResourceCategory, ResourceType, ContactMethod,
+    CRISIS_CATEGORIES, MENTAL_HEALTH_CATEGORIES
+)
 from ..config.settings import settings
+from .circuit_breaker import CircuitBreaker
+
+
+# Validators for API responses, built once
+_RESOURCE_LIST = TypeAdapter(List[Resource])
+_BUNDLE_LIST = TypeAdapter(List[ResourceBundle])
+
+# Splits searchable text into word tokens
+_TOKENS = re.compile(r'\w+').findall
+
+# Maximum number of query words whose index matches are remembered
+WORD_MATCH_CACHE_SIZE = 4096
+
+
+def _normalize_location(location: Optional[str]) -> Optional[str]:
+    """Normalize a location code once at the facade, e.g. 'us' -> 'US'."""
+    return location.upper() if location else location
 
 
 class BaseDirectoryLookup(ABC):
     """Abstract base class for directory lookups."""
     
     @abstractmethod
-    async def get_resources(self, location: str, categories: List[str] = None) -> List[Resource]:
+    async def get_resources(self, location: str, categories: Collection[str] = None) -> List[Resource]:
         """Get resources for a specific location and categories."""
         pass
     
@@ -29,18 +54,63 @@ class BaseDirectoryLookup(ABC):
     async def search_resources(self, query: str, location: str = None) -> List[Resource]:
         """Search resources by query."""
         pass
+    
+    async def aclose(self):
+        """Release connections held by the backend."""
+        pass
+    
+    def clear_cache(self):
+        """Drop cached directory data; backends without a cache have nothing to drop."""
+        pass
 
 
 class MockDirectoryLookup(BaseDirectoryLookup):
-    """Mock directory lookup for testing and development."""
+    """Mock directory lookup for testing and development.
+    
+    Building the directories and their indexes is costly, so use the shared
+    instance from _mock_directory_lookup() rather than constructing new ones.
+    """
     
     def __init__(self):
         self.directories = self._create_mock_directories()
+        self._build_indexes()
+    
+    def _build_indexes(self):
+        """Index resources by category and bundles by risk level for each location."""
+        # location -> category -> resources, location -> risk level -> bundles
+        self._category_index: Dict[str, Dict[str, List[Resource]]] = {}
+        self._risk_index: Dict[str, Dict[str, List[ResourceBundle]]] = {}
+        # location -> resource ID -> position, to keep results in directory order
+        self._positions: Dict[str, Dict[str, int]] = {}
+        # location -> resource ID -> lowercase searchable text, location -> token -> resource IDs
+        self._search_text: Dict[str, Dict[str, str]] = {}
+        self._token_index: Dict[str, Dict[str, Set[str]]] = {}
+        # LRU of (location, query word) -> IDs of resources with a token containing it
+        self._word_matches: OrderedDict = OrderedDict()
+        
+        for location, directory in self.directories.items():
+            categories = self._category_index[location] = {}
+            positions = self._positions[location] = {}
+            for position, resource in enumerate(directory.resources):
+                categories.setdefault(resource.category.value, []).append(resource)
+                positions[resource.resource_id] = position
+            
+            texts = self._search_text[location] = {}
+            tokens = self._token_index[location] = {}
+            for resource in directory.resources:
+                # Search in name, description, and specializations
+                text = f"{resource.name} {resource.description} {' '.join(resource.specializations)}".lower()
+                texts[resource.resource_id] = text
+                for token in set(_TOKENS(text)):
+                    tokens.setdefault(token, set()).add(resource.resource_id)
+            
+            risk_levels = self._risk_index[location] = {}
+            for bundle in directory.bundles:
+                for risk_level in bundle.risk_levels:
+                    risk_levels.setdefault(risk_level, []).append(bundle)
     
     def _create_mock_directories(self) -> Dict[str, ResourceDirectory]:
         """Create mock directory data."""
-        from ..schemas.resources import ContactMethod, ResourceType
-        
         # Create mock resources
         resources = {
             'US': [
@@ -202,41 +272,32 @@ class MockDirectoryLookup(BaseDirectoryLookup):
         
         return directories
     
-    async def get_resources(self, location: str, categories: List[str] = None) -> List[Resource]:
+    async def get_resources(self, location: str, categories: Collection[str] = None) -> List[Resource]:
         """Get resources for a specific location and categories."""
-        location = location.upper()
         if location not in self.directories:
             location = 'US'  # Default to US
         
-        resources = self.directories[location].resources
-        
-        # Filter by categories if specified
+        # Filter by categories if specified, via the category index
         if categories:
-            filtered_resources = []
-            for resource in resources:
-                if resource.category.value in categories:
-                    filtered_resources.append(resource)
-            return filtered_resources
+            index = self._category_index[location]
+            positions = self._positions[location]
+            matches = [resource for category in set(categories) for resource in index.get(category, ())]
+            matches.sort(key=lambda resource: positions[resource.resource_id])
+            return matches
         
-        return resources
+        # Copy, so callers cannot change the shared directory
+        return list(self.directories[location].resources)
     
     async def get_resource_bundles(self, location: str, risk_level: str = None) -> List[ResourceBundle]:
         """Get resource bundles for a location and risk level."""
-        location = location.upper()
         if location not in self.directories:
             location = 'US'  # Default to US
         
-        bundles = self.directories[location].bundles
-        
         # Filter by risk level if specified
         if risk_level:
-            filtered_bundles = []
-            for bundle in bundles:
-                if risk_level in bundle.risk_levels:
-                    filtered_bundles.append(bundle)
-            return filtered_bundles
+            return list(self._risk_index[location].get(risk_level, ()))
         
-        return bundles
+        return list(self.directories[location].bundles)
     
     async def search_resources(self, query: str, location: str = None) -> List[Resource]:
         """Search resources by query."""
@@ -244,89 +305,194 @@ class MockDirectoryLookup(BaseDirectoryLookup):
         results = []
         
         # Search in specified location or all locations
-        locations = [location.upper()] if location else ['US', 'CA']
+        locations = [location] if location else ['US', 'CA']
         
         for loc in locations:
             if loc in self.directories:
-                for resource in self.directories[loc].resources:
-                    # Search in name, description, and specializations
-                    searchable_text = f"{resource.name} {resource.description} {' '.join(resource.specializations)}".lower()
-                    if query_lower in searchable_text:
-                        results.append(resource)
+                results.extend(self._search_location(loc, query_lower))
         
         return results
+    
+    def _search_location(self, location: str, query: str) -> List[Resource]:
+        """Find resources in one location whose searchable text contains the query."""
+        texts = self._search_text[location]
+        
+        # Every word of the query must fall inside some token of a match,
+        # so the token index narrows the candidates before the substring check
+        candidates = texts.keys()
+        for query_token in _TOKENS(query):
+            candidates = self._word_matches_for(location, query_token).intersection(candidates)
+            if not candidates:
+                return []
+        
+        directory = self.directories[location]
+        matches = sorted((rid for rid in candidates if query in texts[rid]), key=self._positions[location].__getitem__)
+        return [directory.get(rid) for rid in matches]
+    
+    def _word_matches_for(self, location: str, word: str) -> frozenset:
+        """Get IDs of resources in a location with a token containing the word."""
+        key = (location, word)
+        resource_ids = self._word_matches.get(key)
+        if resource_ids is not None:
+            self._word_matches.move_to_end(key)
+            return resource_ids
+        
+        # Scanning the vocabulary is the costly step, so remember its result
+        matched = set()
+        for token, token_ids in self._token_index[location].items():
+            if word in token:
+                matched |= token_ids
+        resource_ids = self._word_matches[key] = frozenset(matched)
+        if len(self._word_matches) > WORD_MATCH_CACHE_SIZE:
+            self._word_matches.popitem(last=False)
+        return resource_ids
+
+
+@lru_cache(maxsize=1)
+def _mock_directory_lookup() -> MockDirectoryLookup:
+    """Get the shared mock directory data used as the API fallback."""
+    return MockDirectoryLookup()
 
 
 class APIDirectoryLookup(BaseDirectoryLookup):
     """API-based directory lookup for production use."""
     
     def __init__(self, api_url: str = None):
+        # A missing URL is reported on first use rather than at construction
         self.api_url = api_url or settings.directory_api_url
-        if not self.api_url:
-            raise ValueError("Directory API URL is required for APIDirectoryLookup")
+        
+        # Served when the API is unreachable or returns an error
+        self._fallback = _mock_directory_lookup()
+        # HTTP session reused across calls to keep connections alive
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Sends calls straight to the fallback while the API keeps failing
+        self._breaker = CircuitBreaker("Directory")
+        # LRU cache of request key -> (expires_at, response), so upstream changes show up within the TTL
+        self._cache: OrderedDict = OrderedDict()
     
-    async def get_resources(self, location: str, categories: List[str] = None) -> List[Resource]:
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the HTTP session shared by all calls, creating it on first use."""
+        if self._session is None or self._session.closed:
+            if not self.api_url:
+                raise ValueError("Directory API URL is required for APIDirectoryLookup")
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60)
+            )
+        return self._session
+    
+    async def aclose(self):
+        """Close the shared HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    def _cache_get(self, key: Tuple) -> Optional[List[Any]]:
+        """Get a cached API response if it has not expired."""
+        entry = self._cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            self._cache.move_to_end(key)
+            return entry[1]
+        return None
+    
+    def _cache_put(self, key: Tuple, value: List[Any]):
+        """Cache an API response for the configured TTL."""
+        self._cache[key] = (time.monotonic() + settings.directory_cache_ttl_seconds, value)
+        self._cache.move_to_end(key)
+        if len(self._cache) > settings.directory_cache_max_size:
+            self._cache.popitem(last=False)
+    
+    def clear_cache(self):
+        """Drop all cached API responses."""
+        self._cache.clear()
+    
+    async def get_resources(self, location: str, categories: Collection[str] = None) -> List[Resource]:
         """Get resources via API."""
-        async with aiohttp.ClientSession() as session:
-            params = {'location': location}
-            if categories:
-                params['categories'] = ','.join(categories)
-            
-            try:
-                async with session.get(f"{self.api_url}/resources", params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return [Resource(**resource_data) for resource_data in data]
-                    else:
-                        # Fallback to mock
-                        mock_lookup = MockDirectoryLookup()
-                        return await mock_lookup.get_resources(location, categories)
-            except Exception as e:
-                # Fallback to mock on error
-                mock_lookup = MockDirectoryLookup()
-                return await mock_lookup.get_resources(location, categories)
+        key = ('resources', location, frozenset(categories) if categories else None)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        if self._breaker.is_open:
+            return await self._fallback.get_resources(location, categories)
+        
+        session = await self._get_session()
+        params = {'location': location}
+        if categories:
+            params['categories'] = ','.join(sorted(set(categories)))
+        
+        try:
+            async with session.get(f"{self.api_url}/resources", params=params) as response:
+                if response.status == 200:
+                    self._breaker.record_success()
+                    resources = _RESOURCE_LIST.validate_json(await response.read())
+                    self._cache_put(key, resources)
+                    return resources
+                else:
+                    if response.status >= 500:
+                        self._breaker.record_failure()
+                    # Fallback to mock
+                    return await self._fallback.get_resources(location, categories)
+        except Exception as e:
+            self._breaker.record_failure()
+            # Fallback to mock on error
+            return await self._fallback.get_resources(location, categories)
     
     async def get_resource_bundles(self, location: str, risk_level: str = None) -> List[ResourceBundle]:
         """Get resource bundles via API."""
-        async with aiohttp.ClientSession() as session:
-            params = {'location': location}
-            if risk_level:
-                params['risk_level'] = risk_level
-            
-            try:
-                async with session.get(f"{self.api_url}/bundles", params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return [ResourceBundle(**bundle_data) for bundle_data in data]
-                    else:
-                        # Fallback to mock
-                        mock_lookup = MockDirectoryLookup()
-                        return await mock_lookup.get_resource_bundles(location, risk_level)
-            except Exception as e:
-                # Fallback to mock on error
-                mock_lookup = MockDirectoryLookup()
-                return await mock_lookup.get_resource_bundles(location, risk_level)
+        key = ('bundles', location, risk_level)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        if self._breaker.is_open:
+            return await self._fallback.get_resource_bundles(location, risk_level)
+        
+        session = await self._get_session()
+        params = {'location': location}
+        if risk_level:
+            params['risk_level'] = risk_level
+        
+        try:
+            async with session.get(f"{self.api_url}/bundles", params=params) as response:
+                if response.status == 200:
+                    self._breaker.record_success()
+                    bundles = _BUNDLE_LIST.validate_json(await response.read())
+                    self._cache_put(key, bundles)
+                    return bundles
+                else:
+                    if response.status >= 500:
+                        self._breaker.record_failure()
+                    # Fallback to mock
+                    return await self._fallback.get_resource_bundles(location, risk_level)
+        except Exception as e:
+            self._breaker.record_failure()
+            # Fallback to mock on error
+            return await self._fallback.get_resource_bundles(location, risk_level)
     
     async def search_resources(self, query: str, location: str = None) -> List[Resource]:
         """Search resources via API."""
-        async with aiohttp.ClientSession() as session:
-            params = {'query': query}
-            if location:
-                params['location'] = location
-            
-            try:
-                async with session.get(f"{self.api_url}/search", params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return [Resource(**resource_data) for resource_data in data]
-                    else:
-                        # Fallback to mock
-                        mock_lookup = MockDirectoryLookup()
-                        return await mock_lookup.search_resources(query, location)
-            except Exception as e:
-                # Fallback to mock on error
-                mock_lookup = MockDirectoryLookup()
-                return await mock_lookup.search_resources(query, location)
+        if self._breaker.is_open:
+            return await self._fallback.search_resources(query, location)
+        
+        session = await self._get_session()
+        params = {'query': query}
+        if location:
+            params['location'] = location
+        
+        try:
+            async with session.get(f"{self.api_url}/search", params=params) as response:
+                if response.status == 200:
+                    self._breaker.record_success()
+                    return _RESOURCE_LIST.validate_json(await response.read())
+                else:
+                    if response.status >= 500:
+                        self._breaker.record_failure()
+                    # Fallback to mock
+                    return await self._fallback.search_resources(query, location)
+        except Exception as e:
+            self._breaker.record_failure()
+            # Fallback to mock on error
+            return await self._fallback.search_resources(query, location)
 
 
 class DirectoryLookup:
@@ -336,35 +502,50 @@ class DirectoryLookup:
         self.lookup_type = lookup_type
         
         if lookup_type == "mock":
-            self.lookup = MockDirectoryLookup()
+            self.lookup = _mock_directory_lookup()
         elif lookup_type == "api":
             self.lookup = APIDirectoryLookup()
         else:
             raise ValueError(f"Unknown lookup type: {lookup_type}")
     
-    async def get_resources(self, location: str, categories: List[str] = None) -> List[Resource]:
+    async def get_resources(self, location: str, categories: Collection[str] = None) -> List[Resource]:
         """Get resources for a location."""
-        return await self.lookup.get_resources(location, categories)
+        return await self.lookup.get_resources(_normalize_location(location), categories)
+    
+    async def get_by_id(self, location: str, resource_id: str) -> Optional[Resource]:
+        """Get a single resource for a location by its ID."""
+        for resource in await self.get_resources(location):
+            if resource.resource_id == resource_id:
+                return resource
+        return None
+    
+    async def aclose(self):
+        """Release connections held by the backend."""
+        await self.lookup.aclose()
+    
+    def clear_cache(self):
+        """Drop cached directory data, e.g. after the directory was updated."""
+        self.lookup.clear_cache()
     
     async def get_resource_bundles(self, location: str, risk_level: str = None) -> List[ResourceBundle]:
         """Get resource bundles for a location."""
-        return await self.lookup.get_resource_bundles(location, risk_level)
+        return await self.lookup.get_resource_bundles(_normalize_location(location), risk_level)
     
     async def search_resources(self, query: str, location: str = None) -> List[Resource]:
         """Search resources by query."""
-        return await self.lookup.search_resources(query, location)
+        return await self.lookup.search_resources(query, _normalize_location(location))
+    
+    async def get_many(self, requests: List[Tuple[str, Collection[str]]]) -> List[List[Resource]]:
+        """Get resources for several (location, categories) requests concurrently."""
+        return await asyncio.gather(*(self.get_resources(location, categories) for location, categories in requests))
     
     async def get_crisis_resources(self, location: str) -> List[Resource]:
         """Get crisis-specific resources."""
-        crisis_categories = [
-            ResourceCategory.SUICIDE_PREVENTION.value,
-            ResourceCategory.CRISIS_INTERVENTION.value
-        ]
-        return await self.get_resources(location, crisis_categories)
+        return await self.get_resources(location, CRISIS_CATEGORIES)
     
     async def get_mental_health_resources(self, location: str) -> List[Resource]:
         """Get mental health resources."""
-        return await self.get_resources(location, [ResourceCategory.MENTAL_HEALTH.value])
+        return await self.get_resources(location, MENTAL_HEALTH_CATEGORIES)
     
     async def get_specialized_resources(self, location: str, category: str) -> List[Resource]:
         """Get resources for a specific category."""
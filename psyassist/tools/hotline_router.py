@@ -3,20 +3,40 @@ Hotline router tool for PsyAssist AI.
 """
 
 import asyncio
+import random
 import aiohttp
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Collection, List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from abc import ABC, abstractmethod
+from pydantic import TypeAdapter
 
-from ..schemas.resources import Resource, ResourceType, ResourceCategory, Availability
+from ..schemas.resources import Resource, ResourceType, ResourceCategory, Availability, ContactMethod, CRISIS_CATEGORIES
+from ..schemas._json import loads
 from ..config.settings import settings
+from .circuit_breaker import CircuitBreaker
+from .directory_lookup import _normalize_location
+
+
+# Emergency numbers by location, read-only
+EMERGENCY_NUMBERS = MappingProxyType({
+    'US': '911',
+    'CA': '911',
+    'UK': '999',
+    'AU': '000'
+})
+DEFAULT_EMERGENCY_NUMBER = '911'
+
+# Validator for API responses, built once
+_RESOURCE_LIST = TypeAdapter(List[Resource])
 
 
 class BaseHotlineRouter(ABC):
     """Abstract base class for hotline routers."""
     
     @abstractmethod
-    async def find_hotlines(self, location: str, categories: List[str] = None) -> List[Resource]:
+    async def find_hotlines(self, location: str, categories: Collection[str] = None) -> List[Resource]:
         """Find available hotlines for given location and categories."""
         pass
     
@@ -29,25 +49,30 @@ class BaseHotlineRouter(ABC):
     async def check_availability(self, resource: Resource) -> Availability:
         """Check availability of a specific resource."""
         pass
+    
+    async def aclose(self):
+        """Release connections held by the backend."""
+        pass
 
 
 class MockHotlineRouter(BaseHotlineRouter):
-    """Mock hotline router for testing and development."""
+    """Mock hotline router for testing and development.
+    
+    Use the shared instance from _mock_hotline_router() rather than
+    constructing new ones, so the hotline data is built once.
+    """
     
     def __init__(self):
         self.mock_hotlines = self._create_mock_hotlines()
-        self.emergency_numbers = {
-            'US': '911',
-            'CA': '911',
-            'UK': '999',
-            'AU': '000',
-            'default': '911'
+        # (category value, hotline) pairs per location for category filtering
+        self._hotline_categories: Dict[str, List[Tuple[str, Resource]]] = {
+            location: [(hotline.category.value, hotline) for hotline in hotlines]
+            for location, hotlines in self.mock_hotlines.items()
         }
+        self.emergency_numbers = EMERGENCY_NUMBERS
     
     def _create_mock_hotlines(self) -> Dict[str, List[Resource]]:
         """Create mock hotline data."""
-        from ..schemas.resources import ContactMethod
-        
         return {
             'US': [
                 Resource(
@@ -116,29 +141,21 @@ class MockHotlineRouter(BaseHotlineRouter):
             ]
         }
     
-    async def find_hotlines(self, location: str, categories: List[str] = None) -> List[Resource]:
+    async def find_hotlines(self, location: str, categories: Collection[str] = None) -> List[Resource]:
         """Find available hotlines for given location and categories."""
-        # Normalize location
-        location = location.upper()
         if location not in self.mock_hotlines:
             location = 'US'  # Default to US
         
-        hotlines = self.mock_hotlines[location]
-        
         # Filter by categories if specified
         if categories:
-            filtered_hotlines = []
-            for hotline in hotlines:
-                if hotline.category.value in categories:
-                    filtered_hotlines.append(hotline)
-            return filtered_hotlines
+            wanted = frozenset(categories)
+            return [hotline for category, hotline in self._hotline_categories[location] if category in wanted]
         
-        return hotlines
+        return self.mock_hotlines[location]
     
     async def get_emergency_number(self, location: str) -> str:
         """Get emergency number for given location."""
-        location = location.upper()
-        return self.emergency_numbers.get(location, self.emergency_numbers['default'])
+        return EMERGENCY_NUMBERS.get(location, DEFAULT_EMERGENCY_NUMBER)
     
     async def check_availability(self, resource: Resource) -> Availability:
         """Check availability of a specific resource."""
@@ -147,70 +164,113 @@ class MockHotlineRouter(BaseHotlineRouter):
             return Availability.AVAILABLE
         elif resource.resource_id == "domestic_violence_hotline":
             # Simulate occasional busy status
-            import random
             return Availability.BUSY if random.random() < 0.1 else Availability.AVAILABLE
         else:
             return Availability.UNKNOWN
 
 
+@lru_cache(maxsize=1)
+def _mock_hotline_router() -> MockHotlineRouter:
+    """Get the shared mock hotline data used as the API fallback."""
+    return MockHotlineRouter()
+
+
 class APIHotlineRouter(BaseHotlineRouter):
     """API-based hotline router for production use."""
     
     def __init__(self, api_url: str = None):
+        # A missing URL is reported on first use rather than at construction
         self.api_url = api_url or settings.hotline_api_url
-        if not self.api_url:
-            raise ValueError("Hotline API URL is required for APIHotlineRouter")
+        
+        # Served when the API is unreachable or returns an error
+        self._fallback = _mock_hotline_router()
+        # HTTP session reused across calls to keep connections alive
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Sends calls straight to the fallback while the API keeps failing
+        self._breaker = CircuitBreaker("Hotline")
     
-    async def find_hotlines(self, location: str, categories: List[str] = None) -> List[Resource]:
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the HTTP session shared by all calls, creating it on first use."""
+        if self._session is None or self._session.closed:
+            if not self.api_url:
+                raise ValueError("Hotline API URL is required for APIHotlineRouter")
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60)
+            )
+        return self._session
+    
+    async def aclose(self):
+        """Close the shared HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    async def find_hotlines(self, location: str, categories: Collection[str] = None) -> List[Resource]:
         """Find available hotlines via API."""
-        async with aiohttp.ClientSession() as session:
-            params = {'location': location}
-            if categories:
-                params['categories'] = ','.join(categories)
-            
-            try:
-                async with session.get(f"{self.api_url}/hotlines", params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return [Resource(**hotline_data) for hotline_data in data]
-                    else:
-                        # Fallback to mock data if API fails
-                        mock_router = MockHotlineRouter()
-                        return await mock_router.find_hotlines(location, categories)
-            except Exception as e:
-                # Fallback to mock data on error
-                mock_router = MockHotlineRouter()
-                return await mock_router.find_hotlines(location, categories)
+        if self._breaker.is_open:
+            return await self._fallback.find_hotlines(location, categories)
+        
+        session = await self._get_session()
+        params = {'location': location}
+        if categories:
+            params['categories'] = ','.join(sorted(set(categories)))
+        
+        try:
+            async with session.get(f"{self.api_url}/hotlines", params=params) as response:
+                if response.status == 200:
+                    self._breaker.record_success()
+                    return _RESOURCE_LIST.validate_json(await response.read())
+                else:
+                    if response.status >= 500:
+                        self._breaker.record_failure()
+                    # Fallback to mock data if API fails
+                    return await self._fallback.find_hotlines(location, categories)
+        except Exception as e:
+            self._breaker.record_failure()
+            # Fallback to mock data on error
+            return await self._fallback.find_hotlines(location, categories)
     
     async def get_emergency_number(self, location: str) -> str:
         """Get emergency number via API."""
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(f"{self.api_url}/emergency", params={'location': location}) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get('number', '911')
-                    else:
-                        # Fallback
-                        mock_router = MockHotlineRouter()
-                        return await mock_router.get_emergency_number(location)
-            except Exception as e:
-                # Fallback
-                mock_router = MockHotlineRouter()
-                return await mock_router.get_emergency_number(location)
+        if self._breaker.is_open:
+            return await self._fallback.get_emergency_number(location)
+        
+        session = await self._get_session()
+        try:
+            async with session.get(f"{self.api_url}/emergency", params={'location': location}) as response:
+                if response.status == 200:
+                    self._breaker.record_success()
+                    data = loads(await response.read())
+                    return data.get('number', '911')
+                else:
+                    if response.status >= 500:
+                        self._breaker.record_failure()
+                    # Fallback
+                    return await self._fallback.get_emergency_number(location)
+        except Exception as e:
+            self._breaker.record_failure()
+            # Fallback
+            return await self._fallback.get_emergency_number(location)
     
     async def check_availability(self, resource: Resource) -> Availability:
         """Check availability via API."""
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(f"{self.api_url}/availability/{resource.resource_id}") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return Availability(data.get('status', 'UNKNOWN'))
-                    else:
-                        return Availability.UNKNOWN
-            except Exception as e:
-                return Availability.UNKNOWN
+        if self._breaker.is_open:
+            return Availability.UNKNOWN
+        
+        session = await self._get_session()
+        try:
+            async with session.get(f"{self.api_url}/availability/{resource.resource_id}") as response:
+                if response.status == 200:
+                    self._breaker.record_success()
+                    data = loads(await response.read())
+                    return Availability(data.get('status', 'UNKNOWN'))
+                else:
+                    if response.status >= 500:
+                        self._breaker.record_failure()
+                    return Availability.UNKNOWN
+        except Exception as e:
+            self._breaker.record_failure()
+            return Availability.UNKNOWN
 
 
 class HotlineRouter:
@@ -220,31 +280,31 @@ class HotlineRouter:
         self.router_type = router_type
         
         if router_type == "mock":
-            self.router = MockHotlineRouter()
+            self.router = _mock_hotline_router()
         elif router_type == "api":
             self.router = APIHotlineRouter()
         else:
             raise ValueError(f"Unknown router type: {router_type}")
     
-    async def find_hotlines(self, location: str, categories: List[str] = None) -> List[Resource]:
+    async def find_hotlines(self, location: str, categories: Collection[str] = None) -> List[Resource]:
         """Find available hotlines."""
-        return await self.router.find_hotlines(location, categories)
+        return await self.router.find_hotlines(_normalize_location(location), categories)
     
     async def get_emergency_number(self, location: str) -> str:
         """Get emergency number."""
-        return await self.router.get_emergency_number(location)
+        return await self.router.get_emergency_number(_normalize_location(location))
     
     async def check_availability(self, resource: Resource) -> Availability:
         """Check resource availability."""
         return await self.router.check_availability(resource)
     
+    async def aclose(self):
+        """Release connections held by the backend."""
+        await self.router.aclose()
+    
     async def get_crisis_resources(self, location: str) -> List[Resource]:
         """Get crisis-specific resources."""
-        crisis_categories = [
-            ResourceCategory.SUICIDE_PREVENTION.value,
-            ResourceCategory.CRISIS_INTERVENTION.value
-        ]
-        return await self.find_hotlines(location, crisis_categories)
+        return await self.find_hotlines(location, CRISIS_CATEGORIES)
     
     async def get_specialized_resources(self, location: str, category: str) -> List[Resource]:
         """Get resources for a specific category."""
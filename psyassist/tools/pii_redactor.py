@@ -4,11 +4,188 @@ PII (Personally Identifiable Information) redactor for PsyAssist AI.
 
 import re
 import hashlib
-from typing import Dict, List, Tuple, Any
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Dict, List, Tuple, Any, Pattern
 from datetime import datetime
 from abc import ABC, abstractmethod
 
 
+# Regex patterns for PII detection, compiled once and shared by all redactors
+PII_PATTERNS: Dict[str, Pattern] = {
+    # Phone numbers
+    'phone': re.compile(r'\b(?:\+?1[-.]?)?\(?([0-9]{3})\)?[-.]?([0-9]{3})[-.]?([0-9]{4})\b'),
+    
+    # Email addresses
+    'email': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+    
+    # Social Security Numbers (US)
+    'ssn': re.compile(r'\b\d{3}-\d{2}-\d{4}\b'),
+    
+    # Credit card numbers
+    'credit_card': re.compile(r'\b\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}\b'),
+    
+    # IP addresses
+    'ip_address': re.compile(r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b'),
+    
+    # Names (basic patterns)
+    'name': re.compile(r'\b[A-Z][a-z]+ [A-Z][a-z]+\b'),
+    
+    # Addresses (basic patterns)
+    'address': re.compile(r'\b\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Lane|Ln|Drive|Dr)\b'),
+    
+    # Dates (various formats)
+    'date': re.compile(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b\d{4}-\d{2}-\d{2}\b'),
+    
+    # ZIP codes (US)
+    'zip_code': re.compile(r'\b\d{5}(?:-\d{4})?\b'),
+}
+
+# Replacement patterns
+PII_REPLACEMENTS: Dict[str, str] = {
+    'phone': '[PHONE]',
+    'email': '[EMAIL]',
+    'ssn': '[SSN]',
+    'credit_card': '[CREDIT_CARD]',
+    'ip_address': '[IP_ADDRESS]',
+    'name': '[NAME]',
+    'address': '[ADDRESS]',
+    'date': '[DATE]',
+    'zip_code': '[ZIP_CODE]',
+}
+
+# Patterns specific to mental health context
+MENTAL_HEALTH_PII_PATTERNS: Dict[str, Pattern] = {
+    # Medication names (common ones)
+    'medication': re.compile(r'\b(?:Prozac|Zoloft|Lexapro|Celexa|Paxil|Wellbutrin|Effexor|Cymbalta|Abilify|Risperdal|Seroquel|Zyprexa|Depakote|Lithium|Xanax|Ativan|Klonopin|Valium|Adderall|Ritalin|Vyvanse)\b', re.IGNORECASE),
+    
+    # Diagnosis terms (be careful with these)
+    'diagnosis': re.compile(r'\b(?:depression|anxiety|bipolar|PTSD|OCD|ADHD|autism|schizophrenia|borderline|narcissistic|antisocial|dependent|avoidant|paranoid|schizoid|histrionic|obsessive|compulsive)\b', re.IGNORECASE),
+    
+    # Hospital/clinic names (basic pattern)
+    'healthcare_facility': re.compile(r'\b(?:Hospital|Clinic|Medical Center|Health Center|Mental Health|Psychiatric|Behavioral Health)\b'),
+    
+    # Insurance information
+    'insurance': re.compile(r'\b[A-Z]{2,3}\d{6,10}\b'),
+    
+    # Medical record numbers
+    'medical_record': re.compile(r'\bMRN[:\s]*\d{6,10}\b'),
+}
+
+MENTAL_HEALTH_PII_REPLACEMENTS: Dict[str, str] = {
+    'medication': '[MEDICATION]',
+    'diagnosis': '[DIAGNOSIS]',
+    'healthcare_facility': '[HEALTHCARE_FACILITY]',
+    'insurance': '[INSURANCE]',
+    'medical_record': '[MEDICAL_RECORD]',
+}
+
+# Characters that every match of a pattern contains, keyed by pattern so a
+# replaced pattern is never assumed to need them
+REQUIRED_CHARACTERS: Dict[Pattern, str] = {
+    PII_PATTERNS['phone']: r'\d',
+    PII_PATTERNS['email']: '@',
+    PII_PATTERNS['ssn']: r'\d',
+    PII_PATTERNS['credit_card']: r'\d',
+    PII_PATTERNS['ip_address']: r'\d',
+    PII_PATTERNS['address']: r'\d',
+    PII_PATTERNS['date']: r'\d',
+    PII_PATTERNS['zip_code']: r'\d',
+    MENTAL_HEALTH_PII_PATTERNS['insurance']: r'\d',
+    MENTAL_HEALTH_PII_PATTERNS['medical_record']: r'\d',
+}
+
+
+# Unescaped opening parentheses of capturing groups
+_CAPTURING_GROUP = re.compile(r'(?<!\\)\((?!\?)')
+
+
+def _alternative(pii_type: str, pattern: Pattern) -> str:
+    """Rewrite a pattern as a named, non-capturing branch of a larger pattern."""
+    source = _CAPTURING_GROUP.sub('(?:', pattern.pattern)
+    if pattern.flags & re.IGNORECASE:
+        source = f'(?i:{source})'
+    return f'(?P<{pii_type}>{source})'
+
+
+@lru_cache(maxsize=None)
+def _combine_patterns(patterns: Tuple[Tuple[str, Pattern], ...]) -> Pattern:
+    """Fuse PII patterns into one alternation with a named group per type.
+    
+    Earlier types win where matches overlap. Case-insensitive patterns keep
+    their flag through a scoped inline group.
+    """
+    combined = '|'.join(_alternative(pii_type, pattern) for pii_type, pattern in patterns)
+    
+    # When every pattern starts at a word boundary, check it once up front so
+    # positions inside words skip the alternation entirely
+    if all(pattern.pattern.startswith(r'\b') for _, pattern in patterns):
+        combined = rf'\b(?:{combined})'
+    return re.compile(combined)
+
+
+@lru_cache(maxsize=None)
+def _prefilter_patterns(patterns: Tuple[Tuple[str, Pattern], ...]) -> Pattern:
+    """Build a cheap check that rules out text none of the patterns can match.
+    
+    Patterns with required characters shrink to one character class in the
+    'required' group; a match there still needs the full scan. Any other
+    match is itself PII.
+    """
+    required = sorted({REQUIRED_CHARACTERS[pattern] for _, pattern in patterns if pattern in REQUIRED_CHARACTERS})
+    alternatives = [f"(?P<required>[{''.join(required)}])"] if required else []
+    alternatives.extend(
+        _alternative(pii_type, pattern)
+        for pii_type, pattern in patterns
+        if pattern not in REQUIRED_CHARACTERS
+    )
+    return re.compile('|'.join(alternatives))
+
+
+class RedactionRecords(Sequence):
+    """Redactions kept as parallel columns, with record dicts built on access."""
+    
+    def __init__(self):
+        self.types: List[str] = []
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.values: List[str] = []
+        self.replacements: List[str] = []
+    
+    def append(self, pii_type: str, start: int, end: int, value: str, replacement: str):
+        """Record one redaction."""
+        self.types.append(pii_type)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.values.append(value)
+        self.replacements.append(replacement)
+    
+    def __len__(self) -> int:
+        return len(self.types)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        
+        value = self.values[index]
+        return {
+            'type': self.types[index],
+            'start': self.starts[index],
+            'end': self.ends[index],
+            'original_value': value,
+            'replacement': self.replacements[index],
+            # Create hash of original value for potential recovery
+            'hash': hashlib.blake2b(value.encode(), digest_size=4).hexdigest()
+        }
+    
+    def __repr__(self) -> str:
+        return repr(self.as_records())
+    
+    def as_records(self) -> List[Dict[str, Any]]:
+        """Get the redactions as a list of record dicts."""
+        return list(self)
+
+
 class BasePIIRedactor(ABC):
     """Abstract base class for PII redactors."""
     
@@ -31,169 +208,117 @@ class RegexPIIRedactor(BasePIIRedactor):
     
     def _build_patterns(self):
         """Build regex patterns for PII detection."""
-        self.patterns = {
-            # Phone numbers
-            'phone': re.compile(r'\b(?:\+?1[-.]?)?\(?([0-9]{3})\)?[-.]?([0-9]{3})[-.]?([0-9]{4})\b'),
-            
-            # Email addresses
-            'email': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
-            
-            # Social Security Numbers (US)
-            'ssn': re.compile(r'\b\d{3}-\d{2}-\d{4}\b'),
-            
-            # Credit card numbers
-            'credit_card': re.compile(r'\b\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}\b'),
-            
-            # IP addresses
-            'ip_address': re.compile(r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b'),
-            
-            # Names (basic patterns)
-            'name': re.compile(r'\b[A-Z][a-z]+ [A-Z][a-z]+\b'),
-            
-            # Addresses (basic patterns)
-            'address': re.compile(r'\b\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Lane|Ln|Drive|Dr)\b'),
-            
-            # Dates (various formats)
-            'date': re.compile(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b\d{4}-\d{2}-\d{2}\b'),
-            
-            # ZIP codes (US)
-            'zip_code': re.compile(r'\b\d{5}(?:-\d{4})?\b'),
-        }
-        
-        # Replacement patterns
-        self.replacements = {
-            'phone': '[PHONE]',
-            'email': '[EMAIL]',
-            'ssn': '[SSN]',
-            'credit_card': '[CREDIT_CARD]',
-            'ip_address': '[IP_ADDRESS]',
-            'name': '[NAME]',
-            'address': '[ADDRESS]',
-            'date': '[DATE]',
-            'zip_code': '[ZIP_CODE]',
-        }
+        self.patterns = dict(PII_PATTERNS)
+        self.replacements = dict(PII_REPLACEMENTS)
+        self._combine()
+    
+    def _combine(self):
+        """Compile the current patterns into a single-pass matcher."""
+        patterns = tuple(self.patterns.items())
+        self.combined = _combine_patterns(patterns)
+        self.prefilter = _prefilter_patterns(patterns)
     
     def redact_text(self, text: str) -> Tuple[str, Dict[str, Any]]:
         """Redact PII from text."""
-        redacted_text = text
+        redactions = RedactionRecords()
+        redacted_text = self._redact_into(text, redactions)
+        
         redaction_metadata = {
-            'redactions': [],
-            'total_redactions': 0,
-            'redaction_types': set(),
+            'redactions': redactions,
+            'total_redactions': len(redactions),
+            'redaction_types': list(set(redactions.types)),
             'original_length': len(text),
-            'redacted_length': len(text)
+            'redacted_length': len(redacted_text)
         }
         
-        for pii_type, pattern in self.patterns.items():
-            matches = list(pattern.finditer(text))
-            
-            for match in matches:
-                original_value = match.group()
-                replacement = self.replacements[pii_type]
-                
-                # Create hash of original value for potential recovery
-                value_hash = hashlib.sha256(original_value.encode()).hexdigest()[:8]
-                
-                redaction_info = {
-                    'type': pii_type,
-                    'start': match.start(),
-                    'end': match.end(),
-                    'original_value': original_value,
-                    'replacement': replacement,
-                    'hash': value_hash
-                }
-                
-                redaction_metadata['redactions'].append(redaction_info)
-                redaction_metadata['redaction_types'].add(pii_type)
-        
-        # Sort redactions by start position (reverse order to maintain indices)
-        redaction_metadata['redactions'].sort(key=lambda x: x['start'], reverse=True)
-        
-        # Apply redactions
-        for redaction in redaction_metadata['redactions']:
-            start = redaction['start']
-            end = redaction['end']
-            replacement = redaction['replacement']
-            
-            redacted_text = redacted_text[:start] + replacement + redacted_text[end:]
+        return redacted_text, redaction_metadata
+    
+    def _redact_into(self, text: str, redactions: RedactionRecords) -> str:
+        """Redact PII from text, recording each redaction in the given records."""
+        if self.prefilter.search(text) is None:
+            return text
         
-        redaction_metadata['total_redactions'] = len(redaction_metadata['redactions'])
-        redaction_metadata['redaction_types'] = list(redaction_metadata['redaction_types'])
-        redaction_metadata['redacted_length'] = len(redacted_text)
+        def replace(match) -> str:
+            pii_type = match.lastgroup
+            replacement = self.replacements[pii_type]
+            redactions.append(pii_type, match.start(), match.end(), match.group(), replacement)
+            return replacement
         
-        return redacted_text, redaction_metadata
+        # One scan finds and replaces all PII, typed by the named group that matched
+        return self.combined.sub(replace, text)
     
     def redact_dict(self, data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """Redact PII from dictionary recursively."""
-        redacted_data = {}
+        redactions = RedactionRecords()
+        redacted_fields = []
+        redacted_data = self._redact_dict_into(data, redactions, redacted_fields)
+        
         redaction_metadata = {
-            'redactions': [],
-            'total_redactions': 0,
-            'redaction_types': set(),
-            'redacted_fields': []
+            'redactions': redactions,
+            'total_redactions': len(redactions),
+            'redaction_types': list(set(redactions.types)),
+            'redacted_fields': redacted_fields
         }
         
+        return redacted_data, redaction_metadata
+    
+    def _redact_dict_into(self, data: Dict[str, Any], redactions: RedactionRecords,
+                          redacted_fields: List[str]) -> Dict[str, Any]:
+        """Redact PII from dictionary recursively, accumulating metadata in place."""
+        redacted_data = {}
+        
         for key, value in data.items():
             if isinstance(value, str):
-                redacted_value, value_metadata = self.redact_text(value)
-                redacted_data[key] = redacted_value
+                count = len(redactions)
+                redacted_data[key] = self._redact_into(value, redactions)
                 
-                if value_metadata['total_redactions'] > 0:
-                    redaction_metadata['redactions'].extend(value_metadata['redactions'])
-                    redaction_metadata['redaction_types'].update(value_metadata['redaction_types'])
-                    redaction_metadata['redacted_fields'].append(key)
+                if len(redactions) > count:
+                    redacted_fields.append(key)
             
             elif isinstance(value, dict):
-                redacted_value, value_metadata = self.redact_dict(value)
-                redacted_data[key] = redacted_value
-                
-                redaction_metadata['redactions'].extend(value_metadata['redactions'])
-                redaction_metadata['redaction_types'].update(value_metadata['redaction_types'])
-                redaction_metadata['redacted_fields'].extend(value_metadata['redacted_fields'])
+                redacted_data[key] = self._redact_dict_into(value, redactions, redacted_fields)
             
             elif isinstance(value, list):
                 redacted_list = []
+                redacted_any = False
                 for item in value:
                     if isinstance(item, str):
-                        redacted_item, item_metadata = self.redact_text(item)
-                        redacted_list.append(redacted_item)
-                        
-                        redaction_metadata['redactions'].extend(item_metadata['redactions'])
-                        redaction_metadata['redaction_types'].update(item_metadata['redaction_types'])
+                        redacted_list.append(self._redact_into(item, redactions))
+                        redacted_any = True
                     
                     elif isinstance(item, dict):
-                        redacted_item, item_metadata = self.redact_dict(item)
-                        redacted_list.append(redacted_item)
-                        
-                        redaction_metadata['redactions'].extend(item_metadata['redactions'])
-                        redaction_metadata['redaction_types'].update(item_metadata['redaction_types'])
+                        # Fields of dictionaries inside lists are not reported
+                        redacted_list.append(self._redact_dict_into(item, redactions, []))
+                        redacted_any = True
                     
                     else:
                         redacted_list.append(item)
                 
                 redacted_data[key] = redacted_list
                 
-                if any(isinstance(item, (str, dict)) for item in value):
-                    redaction_metadata['redacted_fields'].append(key)
+                if redacted_any:
+                    redacted_fields.append(key)
             
             else:
                 redacted_data[key] = value
         
-        redaction_metadata['total_redactions'] = len(redaction_metadata['redactions'])
-        redaction_metadata['redaction_types'] = list(redaction_metadata['redaction_types'])
-        
-        return redacted_data, redaction_metadata
+        return redacted_data
     
     def is_pii_present(self, text: str) -> bool:
         """Check if PII is present in text."""
-        for pattern in self.patterns.values():
-            if pattern.search(text):
-                return True
-        return False
+        match = self.prefilter.search(text)
+        if match is None:
+            return False
+        if match.lastgroup != 'required':
+            return True
+        return self.combined.search(text) is not None
     
     def get_pii_types(self, text: str) -> List[str]:
         """Get types of PII present in text."""
         pii_types = []
+        if self.prefilter.search(text) is None:
+            return pii_types
+        
         for pii_type, pattern in self.patterns.items():
             if pattern.search(text):
                 pii_types.append(pii_type)
@@ -209,35 +334,20 @@ class CustomPIIRedactor(RegexPIIRedactor):
     
     def _add_mental_health_patterns(self):
         """Add patterns specific to mental health context."""
-        mental_health_patterns = {
-            # Medication names (common ones)
-            'medication': re.compile(r'\b(?:Prozac|Zoloft|Lexapro|Celexa|Paxil|Wellbutrin|Effexor|Cymbalta|Abilify|Risperdal|Seroquel|Zyprexa|Depakote|Lithium|Xanax|Ativan|Klonopin|Valium|Adderall|Ritalin|Vyvanse)\b', re.IGNORECASE),
-            
-            # Diagnosis terms (be careful with these)
-            'diagnosis': re.compile(r'\b(?:depression|anxiety|bipolar|PTSD|OCD|ADHD|autism|schizophrenia|borderline|narcissistic|antisocial|dependent|avoidant|paranoid|schizoid|histrionic|obsessive|compulsive)\b', re.IGNORECASE),
-            
-            # Hospital/clinic names (basic pattern)
-            'healthcare_facility': re.compile(r'\b(?:Hospital|Clinic|Medical Center|Health Center|Mental Health|Psychiatric|Behavioral Health)\b'),
-            
-            # Insurance information
-            'insurance': re.compile(r'\b[A-Z]{2,3}\d{6,10}\b'),
-            
-            # Medical record numbers
-            'medical_record': re.compile(r'\bMRN[:\s]*\d{6,10}\b'),
-        }
-        
-        self.patterns.update(mental_health_patterns)
-        
-        # Add replacements for new patterns
-        new_replacements = {
-            'medication': '[MEDICATION]',
-            'diagnosis': '[DIAGNOSIS]',
-            'healthcare_facility': '[HEALTHCARE_FACILITY]',
-            'insurance': '[INSURANCE]',
-            'medical_record': '[MEDICAL_RECORD]',
-        }
-        
-        self.replacements.update(new_replacements)
+        self.patterns.update(MENTAL_HEALTH_PII_PATTERNS)
+        self.replacements.update(MENTAL_HEALTH_PII_REPLACEMENTS)
+        self._combine()
+
+
+@lru_cache(maxsize=None)
+def _pii_redactor(redactor_type: str) -> BasePIIRedactor:
+    """Get the shared redactor of a type; redactors hold no per-call state."""
+    if redactor_type == "basic":
+        return RegexPIIRedactor()
+    elif redactor_type == "custom":
+        return CustomPIIRedactor()
+    else:
+        raise ValueError(f"Unknown redactor type: {redactor_type}")
 
 
 class PIIRedactor:
@@ -245,13 +355,7 @@ class PIIRedactor:
     
     def __init__(self, redactor_type: str = "custom"):
         self.redactor_type = redactor_type
-        
-        if redactor_type == "basic":
-            self.redactor = RegexPIIRedactor()
-        elif redactor_type == "custom":
-            self.redactor = CustomPIIRedactor()
-        else:
-            raise ValueError(f"Unknown redactor type: {redactor_type}")
+        self.redactor = _pii_redactor(redactor_type)
     
     def redact_text(self, text: str) -> Tuple[str, Dict[str, Any]]:
         """Redact PII from text."""
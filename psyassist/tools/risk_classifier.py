@@ -5,13 +5,49 @@ Risk classifier tool for PsyAssist AI safety system.
 import re
 import json
 from typing import List, Dict, Any, Optional
-from datetime import datetime
 from abc import ABC, abstractmethod
 
-from ..schemas.risk import RiskAssessment, RiskFactor, RiskCategory, RiskSeverity, RiskKeywords
+from ..schemas.risk import RiskAssessment, RiskFactor, RiskCategory, RiskSeverity, RiskKeywords, SEVERITY_ORDER, SEVERITY_BY_RANK
 from ..config.settings import settings
 
 
+# Risk categories of the keyword lists, by the names RiskKeywords.scan reports
+KEYWORD_CATEGORIES: Dict[str, RiskCategory] = {
+    'suicide': RiskCategory.SUICIDE,
+    'self_harm': RiskCategory.SELF_HARM,
+    'harm_to_others': RiskCategory.HARM_TO_OTHERS,
+    'crisis': RiskCategory.CRISIS,
+}
+
+# Context indicators that adjust keyword severity and confidence, matched as substrings
+IMMEDIATE_INDICATORS = re.compile('|'.join(map(re.escape, ['now', 'tonight', 'today', 'immediately', 'right now'])))
+PLAN_INDICATORS = re.compile('|'.join(map(re.escape, ['plan', 'going to', 'will', 'intend', 'decided'])))
+MEANS_INDICATORS = re.compile('|'.join(map(re.escape, ['gun', 'pills', 'rope', 'knife', 'weapon'])))
+AMBIGUOUS_INDICATORS = re.compile('|'.join(map(re.escape, ['joke', 'just kidding', 'not really', 'metaphor'])))
+
+# Base severity rank of each keyword category before context adjustments
+CATEGORY_BASE_RANK: Dict[RiskCategory, int] = {
+    RiskCategory.SUICIDE: SEVERITY_ORDER[RiskSeverity.HIGH],
+    RiskCategory.SELF_HARM: SEVERITY_ORDER[RiskSeverity.MEDIUM],
+    RiskCategory.HARM_TO_OTHERS: SEVERITY_ORDER[RiskSeverity.HIGH],
+    RiskCategory.CRISIS: SEVERITY_ORDER[RiskSeverity.MEDIUM],
+}
+
+# Any word character; text without one cannot contain a risk keyword or pattern
+_WORD_CHARACTER = re.compile(r'\w')
+
+_LOW = SEVERITY_ORDER[RiskSeverity.LOW]
+_MEDIUM = SEVERITY_ORDER[RiskSeverity.MEDIUM]
+_HIGH = SEVERITY_ORDER[RiskSeverity.HIGH]
+
+
+def _assessment_id() -> str:
+    """Generate a unique assessment ID."""
+    # Imported here since psyassist.core imports the tools
+    from ..core.ids import new_id
+    return f"risk_{new_id()}"
+
+
 class BaseRiskClassifier(ABC):
     """Abstract base class for risk classifiers."""
     
@@ -31,34 +67,30 @@ class KeywordBasedRiskClassifier(BaseRiskClassifier):
     
     def __init__(self, keywords: RiskKeywords = None):
         self.keywords = keywords or RiskKeywords()
-        self._build_patterns()
-    
-    def _build_patterns(self):
-        """Build regex patterns for keyword detection."""
-        self.patterns = {}
         
-        # Build patterns for each category
+        # Position of each keyword in its list, so matches are reported in list order
         category_keywords = {
             RiskCategory.SUICIDE: self.keywords.suicide_keywords,
             RiskCategory.SELF_HARM: self.keywords.self_harm_keywords,
             RiskCategory.HARM_TO_OTHERS: self.keywords.harm_to_others_keywords,
             RiskCategory.CRISIS: self.keywords.crisis_keywords,
         }
-        
-        for category, keywords in category_keywords.items():
-            pattern = r'\b(' + '|'.join(re.escape(kw) for kw in keywords) + r')\b'
-            self.patterns[category] = re.compile(pattern, re.IGNORECASE)
-        
-        # Build complex patterns
-        for pattern_name, pattern_str in self.keywords.patterns.items():
-            self.patterns[pattern_name] = re.compile(pattern_str, re.IGNORECASE)
+        self._keyword_rank = {
+            (category, keyword): rank
+            for category, keywords in category_keywords.items()
+            for rank, keyword in enumerate(keywords)
+        }
     
     async def assess_risk(self, text: str, context: Dict[str, Any] = None) -> RiskAssessment:
         """Assess overall risk level in text."""
+        return self.assess_risk_sync(text, context)
+    
+    def assess_risk_sync(self, text: str, context: Dict[str, Any] = None) -> RiskAssessment:
+        """Assess overall risk level in text without awaiting; no I/O is involved."""
         context = context or {}
         
         # Classify individual risk factors
-        risk_factors = await self.classify_keywords(text)
+        risk_factors = self.classify_keywords_sync(text)
         
         # Determine overall severity
         overall_severity = self._determine_overall_severity(risk_factors, context)
@@ -66,7 +98,7 @@ class KeywordBasedRiskClassifier(BaseRiskClassifier):
         
         # Create assessment
         assessment = RiskAssessment(
-            assessment_id=f"risk_{datetime.utcnow().isoformat()}",
+            assessment_id=_assessment_id(),
             session_id=context.get('session_id', 'unknown'),
             overall_severity=overall_severity,
             overall_confidence=overall_confidence,
@@ -79,39 +111,44 @@ class KeywordBasedRiskClassifier(BaseRiskClassifier):
     
     async def classify_keywords(self, text: str) -> List[RiskFactor]:
         """Classify risk keywords in text."""
+        return self.classify_keywords_sync(text)
+    
+    def classify_keywords_sync(self, text: str) -> List[RiskFactor]:
+        """Classify risk keywords in text without awaiting."""
         risk_factors = []
-        text_lower = text.lower()
         
-        # Check each category
-        category_keywords = {
-            RiskCategory.SUICIDE: self.keywords.suicide_keywords,
-            RiskCategory.SELF_HARM: self.keywords.self_harm_keywords,
-            RiskCategory.HARM_TO_OTHERS: self.keywords.harm_to_others_keywords,
-            RiskCategory.CRISIS: self.keywords.crisis_keywords,
+        # Scan the context indicators once, not once per category
+        text_lower = text.lower()
+        flags = {
+            'immediate': IMMEDIATE_INDICATORS.search(text_lower) is not None,
+            'plan': PLAN_INDICATORS.search(text_lower) is not None,
+            'means': MEANS_INDICATORS.search(text_lower) is not None,
+            'ambiguous': AMBIGUOUS_INDICATORS.search(text_lower) is not None,
         }
         
-        for category, keywords in category_keywords.items():
-            found_keywords = []
-            for keyword in keywords:
-                if keyword.lower() in text_lower:
-                    found_keywords.append(keyword)
-            
+        # Find the keywords of every category in a single pass over the text
+        found: Dict[RiskCategory, List[str]] = {category: [] for category in KEYWORD_CATEGORIES.values()}
+        for category_name, keyword in self.keywords.scan(text):
+            found[KEYWORD_CATEGORIES[category_name]].append(keyword)
+        
+        for category, found_keywords in found.items():
             if found_keywords:
-                severity = self._determine_severity_for_category(category, found_keywords, text)
-                confidence = self._calculate_category_confidence(category, found_keywords, text)
+                found_keywords.sort(key=lambda keyword: self._keyword_rank[(category, keyword)])
+                severity = self._determine_severity_for_category(category, found_keywords, flags)
+                confidence = self._calculate_category_confidence(category, found_keywords, flags)
                 
                 risk_factor = RiskFactor(
                     category=category,
                     severity=severity,
                     confidence=confidence,
                     keywords=found_keywords,
-                    context=self._extract_context(text, found_keywords)
+                    context=self._extract_context(text, found_keywords, text_lower)
                 )
                 risk_factors.append(risk_factor)
         
         # Check complex patterns
-        for pattern_name, pattern in self.keywords.patterns.items():
-            if re.search(pattern, text, re.IGNORECASE):
+        for pattern_name, matched in self.keywords.search(text).items():
+            if matched:
                 # Map pattern to category
                 category = self._map_pattern_to_category(pattern_name)
                 severity = RiskSeverity.HIGH if 'immediate' in pattern_name else RiskSeverity.MEDIUM
@@ -127,48 +164,23 @@ class KeywordBasedRiskClassifier(BaseRiskClassifier):
         
         return risk_factors
     
-    def _determine_severity_for_category(self, category: RiskCategory, keywords: List[str], text: str) -> RiskSeverity:
+    def _determine_severity_for_category(self, category: RiskCategory, keywords: List[str], flags: Dict[str, bool]) -> RiskSeverity:
         """Determine severity level for a specific category."""
-        # Base severity mapping
-        base_severity = {
-            RiskCategory.SUICIDE: RiskSeverity.HIGH,
-            RiskCategory.SELF_HARM: RiskSeverity.MEDIUM,
-            RiskCategory.HARM_TO_OTHERS: RiskSeverity.HIGH,
-            RiskCategory.CRISIS: RiskSeverity.MEDIUM,
-        }
+        rank = CATEGORY_BASE_RANK.get(category, _LOW)
         
-        severity = base_severity.get(category, RiskSeverity.LOW)
+        # Adjust based on context, one level per indicator
+        # Immediate/urgent indicators escalate MEDIUM and HIGH
+        rank += flags['immediate'] and _MEDIUM <= rank <= _HIGH
         
-        # Adjust based on context
-        text_lower = text.lower()
+        # Plan indicators escalate LOW and MEDIUM
+        rank += flags['plan'] and _LOW <= rank <= _MEDIUM
+        
+        # Means indicators escalate MEDIUM and HIGH
+        rank += flags['means'] and _MEDIUM <= rank <= _HIGH
         
-        # Immediate/urgent indicators
-        immediate_indicators = ['now', 'tonight', 'today', 'immediately', 'right now']
-        if any(indicator in text_lower for indicator in immediate_indicators):
-            if severity == RiskSeverity.MEDIUM:
-                severity = RiskSeverity.HIGH
-            elif severity == RiskSeverity.HIGH:
-                severity = RiskSeverity.CRITICAL
-        
-        # Plan indicators
-        plan_indicators = ['plan', 'going to', 'will', 'intend', 'decided']
-        if any(indicator in text_lower for indicator in plan_indicators):
-            if severity == RiskSeverity.LOW:
-                severity = RiskSeverity.MEDIUM
-            elif severity == RiskSeverity.MEDIUM:
-                severity = RiskSeverity.HIGH
-        
-        # Means indicators
-        means_indicators = ['gun', 'pills', 'rope', 'knife', 'weapon']
-        if any(indicator in text_lower for indicator in means_indicators):
-            if severity == RiskSeverity.MEDIUM:
-                severity = RiskSeverity.HIGH
-            elif severity == RiskSeverity.HIGH:
-                severity = RiskSeverity.CRITICAL
-        
-        return severity
+        return SEVERITY_BY_RANK[rank]
     
-    def _calculate_category_confidence(self, category: RiskCategory, keywords: List[str], text: str) -> float:
+    def _calculate_category_confidence(self, category: RiskCategory, keywords: List[str], flags: Dict[str, bool]) -> float:
         """Calculate confidence level for a category."""
         base_confidence = 0.6
         
@@ -181,9 +193,7 @@ class KeywordBasedRiskClassifier(BaseRiskClassifier):
             keyword_bonus += 0.2
         
         # Decrease confidence for ambiguous context
-        ambiguous_indicators = ['joke', 'just kidding', 'not really', 'metaphor']
-        text_lower = text.lower()
-        if any(indicator in text_lower for indicator in ambiguous_indicators):
+        if flags['ambiguous']:
             keyword_bonus -= 0.2
         
         return min(base_confidence + keyword_bonus, 1.0)
@@ -194,16 +204,7 @@ class KeywordBasedRiskClassifier(BaseRiskClassifier):
             return RiskSeverity.NONE
         
         # Get the highest severity
-        severities = [factor.severity for factor in risk_factors]
-        severity_order = {
-            RiskSeverity.NONE: 0,
-            RiskSeverity.LOW: 1,
-            RiskSeverity.MEDIUM: 2,
-            RiskSeverity.HIGH: 3,
-            RiskSeverity.CRITICAL: 4
-        }
-        
-        max_severity = max(severities, key=lambda s: severity_order[s])
+        max_severity = SEVERITY_BY_RANK[max(SEVERITY_ORDER[factor.severity] for factor in risk_factors)]
         
         # Consider context factors
         if context.get('previous_risk_level') == RiskSeverity.HIGH:
@@ -223,14 +224,8 @@ class KeywordBasedRiskClassifier(BaseRiskClassifier):
         weighted_sum = 0
         
         for factor in risk_factors:
-            # Weight by severity
-            severity_weight = {
-                RiskSeverity.NONE: 0,
-                RiskSeverity.LOW: 1,
-                RiskSeverity.MEDIUM: 2,
-                RiskSeverity.HIGH: 3,
-                RiskSeverity.CRITICAL: 4
-            }[factor.severity]
+            # Weight by severity rank, from NONE = 0 to CRITICAL = 4
+            severity_weight = SEVERITY_ORDER[factor.severity]
             
             weighted_sum += factor.confidence * severity_weight
             total_weight += severity_weight
@@ -240,16 +235,20 @@ class KeywordBasedRiskClassifier(BaseRiskClassifier):
         
         return weighted_sum / total_weight
     
-    def _extract_context(self, text: str, keywords: List[str]) -> str:
+    def _extract_context(self, text: str, keywords: List[str], text_lower: str = None) -> str:
         """Extract context around keywords."""
         if not keywords:
             return ""
         
+        if text_lower is None:
+            text_lower = text.lower()
+        
         # Find the first keyword and extract surrounding context
         for keyword in keywords:
-            if keyword.lower() in text.lower():
-                start = max(0, text.lower().find(keyword.lower()) - 50)
-                end = min(len(text), text.lower().find(keyword.lower()) + len(keyword) + 50)
+            index = text_lower.find(keyword.lower())
+            if index >= 0:
+                start = max(0, index - 50)
+                end = min(len(text), index + len(keyword) + 50)
                 return text[start:end].strip()
         
         return ""
@@ -275,8 +274,19 @@ class AIRiskClassifier(BaseRiskClassifier):
         """Assess risk using AI model."""
         context = context or {}
         
+        # Empty or symbol-only messages skip both the keyword pass and the model
+        if self._is_trivial(text):
+            return RiskAssessment(
+                assessment_id=_assessment_id(),
+                session_id=context.get('session_id', 'unknown'),
+                overall_severity=RiskSeverity.NONE,
+                overall_confidence=0.0,
+                assessor="KeywordBasedRiskClassifier",
+                model_used="keyword_pattern_matching"
+            )
+        
         # First, use keyword classifier for immediate detection
-        keyword_assessment = await self.keyword_classifier.assess_risk(text, context)
+        keyword_assessment = self.keyword_classifier.assess_risk_sync(text, context)
         
         # If high risk detected, return immediately
         if keyword_assessment.overall_severity in [RiskSeverity.HIGH, RiskSeverity.CRITICAL]:
@@ -288,6 +298,11 @@ class AIRiskClassifier(BaseRiskClassifier):
         
         return keyword_assessment
     
+    @staticmethod
+    def _is_trivial(text: str) -> bool:
+        """Whether text has nothing a keyword or the model could assess."""
+        return _WORD_CHARACTER.search(text) is None
+    
     async def _ai_assessment(self, text: str, context: Dict[str, Any], keyword_assessment: RiskAssessment) -> RiskAssessment:
         """Perform AI-based risk assessment."""
         # This would integrate with an LLM for more nuanced assessment
@@ -296,7 +311,7 @@ class AIRiskClassifier(BaseRiskClassifier):
     
     async def classify_keywords(self, text: str) -> List[RiskFactor]:
         """Classify keywords using keyword-based approach."""
-        return await self.keyword_classifier.classify_keywords(text)
+        return self.keyword_classifier.classify_keywords_sync(text)
 
 
 class RiskClassifier:
@@ -314,18 +329,25 @@ class RiskClassifier:
     
     async def assess_risk(self, text: str, context: Dict[str, Any] = None) -> RiskAssessment:
         """Assess risk in text."""
+        if isinstance(self.classifier, KeywordBasedRiskClassifier):
+            # Keyword matching is CPU-only, so skip the nested coroutines
+            return self.classifier.assess_risk_sync(text, context)
         return await self.classifier.assess_risk(text, context)
     
     async def classify_keywords(self, text: str) -> List[RiskFactor]:
         """Classify risk keywords in text."""
+        if isinstance(self.classifier, KeywordBasedRiskClassifier):
+            return self.classifier.classify_keywords_sync(text)
         return await self.classifier.classify_keywords(text)
     
     def should_escalate(self, assessment: RiskAssessment) -> bool:
         """Determine if escalation is needed based on assessment."""
-        escalation_threshold = RiskSeverity(settings.escalation_threshold)
-        return assessment.overall_severity >= escalation_threshold and assessment.overall_confidence >= 0.7
+        escalation_threshold = RiskSeverity.from_value(settings.escalation_threshold)
+        return (SEVERITY_ORDER[assessment.overall_severity] >= SEVERITY_ORDER[escalation_threshold]
+                and assessment.overall_confidence >= 0.7)
     
     def is_emergency(self, assessment: RiskAssessment) -> bool:
         """Determine if emergency response is needed."""
-        emergency_threshold = RiskSeverity(settings.emergency_threshold)
-        return assessment.overall_severity >= emergency_threshold and assessment.overall_confidence >= 0.8
+        emergency_threshold = RiskSeverity.from_value(settings.emergency_threshold)
+        return (SEVERITY_ORDER[assessment.overall_severity] >= SEVERITY_ORDER[emergency_threshold]
+                and assessment.overall_confidence >= 0.8)
@@ -3,8 +3,10 @@ Warm transfer API tool for PsyAssist AI.
 """
 
 import asyncio
+import time
 import aiohttp
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 from abc import ABC, abstractmethod
 
@@ -12,6 +14,20 @@ from ..schemas.resources import Resource
 from ..config.settings import settings
 
 
+# Transfer statuses that no longer change
+FINISHED_TRANSFER_STATUSES = frozenset({'completed', 'cancelled', 'failed'})
+
+# Number of resources whose contact information the mock keeps
+CONTACT_CACHE_SIZE = 1024
+
+# Attempts to connect to the warm transfer API before falling back to the mock
+CONNECT_ATTEMPTS = 2
+
+# Limits of the status snapshot cache; callers only reuse snapshots for seconds
+STATUS_CACHE_SIZE = 1024
+STATUS_CACHE_MAX_AGE_SECONDS = 300
+
+
 class BaseWarmTransferAPI(ABC):
     """Abstract base class for warm transfer APIs."""
     
@@ -29,19 +45,33 @@ class BaseWarmTransferAPI(ABC):
     async def cancel_transfer(self, transfer_id: str) -> bool:
         """Cancel an active transfer."""
         pass
+    
+    async def aclose(self):
+        """Release connections held by the backend."""
+        pass
 
 
 class MockWarmTransferAPI(BaseWarmTransferAPI):
     """Mock warm transfer API for testing and development."""
     
-    def __init__(self):
-        self.active_transfers = {}
+    def __init__(self, max_transfers: int = 10000, finished_ttl_seconds: float = 3600):
+        # Transfers in least recently used order, bounded by max_transfers
+        self.active_transfers: OrderedDict = OrderedDict()
         self.transfer_counter = 0
+        self.max_transfers = max_transfers
+        self.finished_ttl_seconds = finished_ttl_seconds
+        # Monotonic initiation time of each transfer, so polls need not parse timestamps
+        self._initiated_at: Dict[str, float] = {}
+        # Pending timers that simulate each transfer's progress
+        self._progress_timers: Dict[str, Tuple[asyncio.TimerHandle, ...]] = {}
+        # Contact information by resource ID, shared by transfers to the same resource
+        self._contact_cache: Dict[str, Dict[str, Any]] = {}
     
     async def initiate_transfer(self, session_id: str, resource: Resource, context: Dict[str, Any]) -> Dict[str, Any]:
         """Initiate a mock warm transfer."""
         self.transfer_counter += 1
-        transfer_id = f"transfer_{self.transfer_counter}_{datetime.utcnow().isoformat()}"
+        initiated_at = datetime.utcnow().isoformat()
+        transfer_id = f"transfer_{self.transfer_counter}_{initiated_at}"
         
         transfer_info = {
             'transfer_id': transfer_id,
@@ -49,16 +79,22 @@ class MockWarmTransferAPI(BaseWarmTransferAPI):
             'resource_id': resource.resource_id,
             'resource_name': resource.name,
             'status': 'initiated',
-            'initiated_at': datetime.utcnow().isoformat(),
+            'initiated_at': initiated_at,
             'estimated_wait_time': 5,  # minutes
             'context': context,
             'contact_info': self._get_contact_info(resource)
         }
         
         self.active_transfers[transfer_id] = transfer_info
+        self._initiated_at[transfer_id] = time.monotonic()
+        self._evict()
         
-        # Simulate async processing
-        asyncio.create_task(self._simulate_transfer_progress(transfer_id))
+        # Simulate async processing with timers rather than a task per transfer
+        loop = asyncio.get_running_loop()
+        self._progress_timers[transfer_id] = (
+            loop.call_later(2, self._set_routing, transfer_id),
+            loop.call_later(5, self._set_connected, transfer_id),
+        )
         
         return transfer_info
     
@@ -72,10 +108,10 @@ class MockWarmTransferAPI(BaseWarmTransferAPI):
             }
         
         transfer_info = self.active_transfers[transfer_id]
+        self.active_transfers.move_to_end(transfer_id)
         
         # Update status based on time elapsed
-        initiated_at = datetime.fromisoformat(transfer_info['initiated_at'])
-        elapsed_minutes = (datetime.utcnow() - initiated_at).total_seconds() / 60
+        elapsed_minutes = (time.monotonic() - self._initiated_at[transfer_id]) / 60
         
         if elapsed_minutes > 10:
             transfer_info['status'] = 'completed'
@@ -92,11 +128,30 @@ class MockWarmTransferAPI(BaseWarmTransferAPI):
             transfer_info = self.active_transfers[transfer_id]
             transfer_info['status'] = 'cancelled'
             transfer_info['cancelled_at'] = datetime.utcnow().isoformat()
+            self._cancel_progress(transfer_id)
             return True
         return False
     
+    def _evict(self):
+        """Drop least recently used transfers over the limit and old finished ones at the front."""
+        now = time.monotonic()
+        while self.active_transfers:
+            transfer_id, transfer_info = next(iter(self.active_transfers.items()))
+            expired = (transfer_info['status'] in FINISHED_TRANSFER_STATUSES
+                       and now - self._initiated_at[transfer_id] > self.finished_ttl_seconds)
+            if not expired and len(self.active_transfers) <= self.max_transfers:
+                break
+            
+            del self.active_transfers[transfer_id]
+            del self._initiated_at[transfer_id]
+            self._cancel_progress(transfer_id)
+    
     def _get_contact_info(self, resource: Resource) -> Dict[str, Any]:
         """Get contact information for the resource."""
+        contact_info = self._contact_cache.get(resource.resource_id)
+        if contact_info is not None:
+            return contact_info
+        
         contact_info = {
             'name': resource.name,
             'description': resource.description,
@@ -114,20 +169,28 @@ class MockWarmTransferAPI(BaseWarmTransferAPI):
         if resource.email:
             contact_info['email'] = resource.email
         
+        if len(self._contact_cache) >= CONTACT_CACHE_SIZE:
+            # Drop the oldest entry to keep the cache bounded
+            del self._contact_cache[next(iter(self._contact_cache))]
+        self._contact_cache[resource.resource_id] = contact_info
         return contact_info
     
-    async def _simulate_transfer_progress(self, transfer_id: str):
-        """Simulate the progress of a transfer."""
-        await asyncio.sleep(2)  # Wait 2 seconds before status change
-        
+    def _set_routing(self, transfer_id: str):
+        """Move a simulated transfer to routing, 2 seconds after initiation."""
         if transfer_id in self.active_transfers:
             self.active_transfers[transfer_id]['status'] = 'routing'
-        
-        await asyncio.sleep(3)  # Wait 3 more seconds before connection
-        
+    
+    def _set_connected(self, transfer_id: str):
+        """Connect a simulated transfer, 5 seconds after initiation."""
+        self._progress_timers.pop(transfer_id, None)
         if transfer_id in self.active_transfers:
             self.active_transfers[transfer_id]['status'] = 'connected'
             self.active_transfers[transfer_id]['connected_at'] = datetime.utcnow().isoformat()
+    
+    def _cancel_progress(self, transfer_id: str):
+        """Stop simulating the progress of a transfer."""
+        for timer in self._progress_timers.pop(transfer_id, ()):
+            timer.cancel()
 
 
 class APIWarmTransferAPI(BaseWarmTransferAPI):
@@ -137,67 +200,83 @@ class APIWarmTransferAPI(BaseWarmTransferAPI):
         self.api_url = api_url or settings.warm_transfer_api_url
         if not self.api_url:
             raise ValueError("Warm transfer API URL is required for APIWarmTransferAPI")
+        
+        # HTTP session reused across calls to keep connections alive
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Serves calls when the API is unreachable or returns an error, keeping
+        # track of the transfers it has started
+        self._fallback = MockWarmTransferAPI()
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the HTTP session shared by all calls, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30),
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60)
+            )
+        return self._session
+    
+    async def aclose(self):
+        """Close the shared HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    async def _request(self, method: str, path: str, read_json: bool = True, **kwargs) -> Any:
+        """Call the API, raising on any response other than 200.
+        
+        Failures to connect, DNS errors included, are retried with backoff; the
+        request was never sent then, so retrying is safe for every method.
+        """
+        session = await self._get_session()
+        for attempt in range(CONNECT_ATTEMPTS):
+            try:
+                async with session.request(method, f"{self.api_url}{path}", **kwargs) as response:
+                    if response.status != 200:
+                        raise aiohttp.ClientResponseError(response.request_info, response.history, status=response.status)
+                    return await response.json() if read_json else None
+            except aiohttp.ClientConnectorError:
+                if attempt == CONNECT_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(0.1 * 2 ** attempt)
     
     async def initiate_transfer(self, session_id: str, resource: Resource, context: Dict[str, Any]) -> Dict[str, Any]:
         """Initiate a warm transfer via API."""
-        async with aiohttp.ClientSession() as session:
-            payload = {
-                'session_id': session_id,
-                'resource_id': resource.resource_id,
-                'resource_info': {
-                    'name': resource.name,
-                    'phone_number': resource.phone_number,
-                    'text_number': resource.text_number,
-                    'website': resource.website,
-                    'email': resource.email
-                },
-                'context': context
-            }
-            
-            try:
-                async with session.post(f"{self.api_url}/transfers", json=payload) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        # Fallback to mock
-                        mock_api = MockWarmTransferAPI()
-                        return await mock_api.initiate_transfer(session_id, resource, context)
-            except Exception as e:
-                # Fallback to mock on error
-                mock_api = MockWarmTransferAPI()
-                return await mock_api.initiate_transfer(session_id, resource, context)
+        payload = {
+            'session_id': session_id,
+            'resource_id': resource.resource_id,
+            'resource_info': {
+                'name': resource.name,
+                'phone_number': resource.phone_number,
+                'text_number': resource.text_number,
+                'website': resource.website,
+                'email': resource.email
+            },
+            'context': context
+        }
+        
+        try:
+            return await self._request('POST', '/transfers', json=payload)
+        except Exception as e:
+            # Fallback to mock on error
+            return await self._fallback.initiate_transfer(session_id, resource, context)
     
     async def check_transfer_status(self, transfer_id: str) -> Dict[str, Any]:
         """Check transfer status via API."""
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(f"{self.api_url}/transfers/{transfer_id}") as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        # Fallback to mock
-                        mock_api = MockWarmTransferAPI()
-                        return await mock_api.check_transfer_status(transfer_id)
-            except Exception as e:
-                # Fallback to mock on error
-                mock_api = MockWarmTransferAPI()
-                return await mock_api.check_transfer_status(transfer_id)
+        try:
+            return await self._request('GET', f'/transfers/{transfer_id}')
+        except Exception as e:
+            # Fallback to mock on error
+            return await self._fallback.check_transfer_status(transfer_id)
     
     async def cancel_transfer(self, transfer_id: str) -> bool:
         """Cancel transfer via API."""
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.delete(f"{self.api_url}/transfers/{transfer_id}") as response:
-                    if response.status == 200:
-                        return True
-                    else:
-                        # Fallback to mock
-                        mock_api = MockWarmTransferAPI()
-                        return await mock_api.cancel_transfer(transfer_id)
-            except Exception as e:
-                # Fallback to mock on error
-                mock_api = MockWarmTransferAPI()
-                return await mock_api.cancel_transfer(transfer_id)
+        try:
+            await self._request('DELETE', f'/transfers/{transfer_id}', read_json=False)
+            return True
+        except Exception as e:
+            # Fallback to mock on error
+            return await self._fallback.cancel_transfer(transfer_id)
 
 
 class WarmTransferAPI:
@@ -212,26 +291,75 @@ class WarmTransferAPI:
             self.api = APIWarmTransferAPI()
         else:
             raise ValueError(f"Unknown API type: {api_type}")
+        
+        # Last status snapshot of each transfer, with the monotonic time it was fetched,
+        # oldest first
+        self._status_cache: OrderedDict = OrderedDict()
     
     async def initiate_transfer(self, session_id: str, resource: Resource, context: Dict[str, Any]) -> Dict[str, Any]:
         """Initiate a warm transfer."""
         return await self.api.initiate_transfer(session_id, resource, context)
     
-    async def check_transfer_status(self, transfer_id: str) -> Dict[str, Any]:
-        """Check transfer status."""
-        return await self.api.check_transfer_status(transfer_id)
+    async def check_transfer_status(self, transfer_id: str, ttl_s: float = 0.0) -> Dict[str, Any]:
+        """Check transfer status, reusing a snapshot younger than ttl_s seconds."""
+        if ttl_s > 0:
+            cached = self._status_cache.get(transfer_id)
+            if cached is not None and time.monotonic() - cached[0] < ttl_s:
+                return cached[1]
+        
+        status_info = await self.api.check_transfer_status(transfer_id)
+        
+        # Keep live transfers only, stamped after the call returns so a slow response
+        # does not look older than it is
+        status = status_info.get('status')
+        if status in FINISHED_TRANSFER_STATUSES or status == 'not_found':
+            self._status_cache.pop(transfer_id, None)
+        else:
+            self._cache_status(transfer_id, status_info)
+        return status_info
+    
+    def _cache_status(self, transfer_id: str, status_info: Dict[str, Any]):
+        """Store a status snapshot, dropping old snapshots and the oldest over the limit."""
+        now = time.monotonic()
+        self._status_cache[transfer_id] = (now, status_info)
+        self._status_cache.move_to_end(transfer_id)
+        
+        # Transfers left connected or abandoned are never polled again, so age them out
+        while self._status_cache:
+            fetched_at, _ = next(iter(self._status_cache.values()))
+            if (now - fetched_at <= STATUS_CACHE_MAX_AGE_SECONDS
+                    and len(self._status_cache) <= STATUS_CACHE_SIZE):
+                break
+            self._status_cache.popitem(last=False)
     
     async def cancel_transfer(self, transfer_id: str) -> bool:
         """Cancel a transfer."""
+        self._status_cache.pop(transfer_id, None)
         return await self.api.cancel_transfer(transfer_id)
     
-    async def wait_for_connection(self, transfer_id: str, timeout_minutes: int = 10) -> Dict[str, Any]:
-        """Wait for transfer to connect with timeout."""
-        start_time = datetime.utcnow()
+    async def aclose(self):
+        """Release connections held by the backend."""
+        await self.api.aclose()
+    
+    async def initiate_and_wait(self, session_id: str, resource: Resource, context: Dict[str, Any],
+                                timeout_minutes: int = 10) -> Dict[str, Any]:
+        """Initiate a warm transfer and wait for it to connect."""
+        transfer_info = await self.initiate_transfer(session_id, resource, context)
+        
+        # The initiation response is the first status snapshot, so no poll is needed for it
+        return await self.wait_for_connection(transfer_info['transfer_id'], timeout_minutes, status_info=transfer_info)
+    
+    async def wait_for_connection(self, transfer_id: str, timeout_minutes: int = 10,
+                                  status_info: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Wait for transfer to connect with timeout, starting from status_info if already known."""
+        start_time = time.monotonic()
         timeout_seconds = timeout_minutes * 60
+        # Poll often while a connection is likely, backing off for long waits
+        interval = 2.0
         
         while True:
-            status_info = await self.check_transfer_status(transfer_id)
+            if status_info is None:
+                status_info = await self.check_transfer_status(transfer_id, ttl_s=interval / 2)
             
             if status_info['status'] in ['connected', 'completed']:
                 return status_info
@@ -240,7 +368,7 @@ class WarmTransferAPI:
                 return status_info
             
             # Check timeout
-            elapsed_seconds = (datetime.utcnow() - start_time).total_seconds()
+            elapsed_seconds = time.monotonic() - start_time
             if elapsed_seconds > timeout_seconds:
                 return {
                     'transfer_id': transfer_id,
@@ -248,12 +376,14 @@ class WarmTransferAPI:
                     'error': 'Transfer timed out'
                 }
             
-            # Wait before checking again
-            await asyncio.sleep(30)  # Check every 30 seconds
+            # Wait before checking again, without sleeping past the timeout
+            await asyncio.sleep(min(interval, timeout_seconds - elapsed_seconds))
+            interval = min(interval * 1.5, 30.0)
+            status_info = None
     
-    async def get_transfer_summary(self, transfer_id: str) -> Dict[str, Any]:
-        """Get a summary of the transfer."""
-        status_info = await self.check_transfer_status(transfer_id)
+    async def get_transfer_summary(self, transfer_id: str, ttl_s: float = 1.0) -> Dict[str, Any]:
+        """Get a summary of the transfer, reusing a status fetched within ttl_s seconds."""
+        status_info = await self.check_transfer_status(transfer_id, ttl_s=ttl_s)
         
         if 'error' in status_info:
             return status_info
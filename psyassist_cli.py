@@ -8,22 +8,16 @@ import sys
 import argparse
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 from typing import Optional, Dict, Any
 from datetime import datetime
 
 BASE_URL = "http://localhost:8000"
 
-class PsyAssistCLI:
-    """Enhanced CLI interface for PsyAssist AI."""
-    
-    def __init__(self):
-        self.session_id = None
-        self.user_id = None
-    
-    def print_banner(self):
-        """Print application banner."""
-        print("""
+# Banner is encoded once, since the menu reprints it on every help command
+BANNER = """
 ╔══════════════════════════════════════════════════════════════╗
 ║                    🧠 PsyAssist AI CLI                      ║
 ║              Emergency Emotional Support System              ║
@@ -38,12 +32,46 @@ class PsyAssistCLI:
 ║    help       - Show this help                               ║
 ║    quit       - Exit CLI                                     ║
 ╚══════════════════════════════════════════════════════════════╝
-        """)
+        """.encode("utf-8") + b"\n"
+
+class PsyAssistCLI:
+    """Enhanced CLI interface for PsyAssist AI."""
+    
+    def __init__(self):
+        self.session_id = None
+        self.user_id = None
+        
+        # One HTTP session for all commands, so connections to the server are kept alive
+        self.http = requests.Session()
+        self.http.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10,
+                                               max_retries=Retry(total=2, backoff_factor=0.1)))
+        
+        # Commands shared by the interactive menu and the command line
+        self.commands = {
+            'health': self.health_check,
+            'status': self.show_status,
+            'session': self.create_session,
+            'chat': self.interactive_chat,
+            'demo': self.run_demo,
+            'test': self.run_tests,
+        }
+    
+    def print_banner(self):
+        """Print application banner."""
+        stdout = getattr(sys.stdout, "buffer", None)
+        if stdout is None:
+            print(BANNER.decode("utf-8"), end="")
+            return
+        
+        # Flush pending text first so the banner stays in order with print() output
+        sys.stdout.flush()
+        stdout.write(BANNER)
+        stdout.flush()
     
     def check_server(self) -> bool:
         """Check if server is running."""
         try:
-            response = requests.get(f"{BASE_URL}/health", timeout=5)
+            response = self.http.get(f"{BASE_URL}/health", timeout=5)
             return response.status_code == 200
         except:
             return False
@@ -58,7 +86,7 @@ class PsyAssistCLI:
             return
         
         try:
-            response = requests.get(f"{BASE_URL}/health")
+            response = self.http.get(f"{BASE_URL}/health")
             data = response.json()
             print(f"✅ Health: {data['status']}")
             print(f"🔧 Service: {data['service']}")
@@ -75,7 +103,7 @@ class PsyAssistCLI:
             return
         
         try:
-            response = requests.get(f"{BASE_URL}/status")
+            response = self.http.get(f"{BASE_URL}/status")
             data = response.json()
             
             print(f"🟢 Health: {data['system_health']}")
@@ -113,7 +141,7 @@ class PsyAssistCLI:
                 }
             }
             
-            response = requests.post(f"{BASE_URL}/sessions", json=payload)
+            response = self.http.post(f"{BASE_URL}/sessions", json=payload)
             data = response.json()
             
             self.session_id = data["session_id"]
@@ -135,7 +163,7 @@ class PsyAssistCLI:
         
         try:
             payload = {"message": message}
-            response = requests.post(
+            response = self.http.post(
                 f"{BASE_URL}/sessions/{self.session_id}/messages",
                 json=payload
             )
@@ -219,7 +247,7 @@ class PsyAssistCLI:
             return
         
         try:
-            response = requests.get(f"{BASE_URL}/sessions/{self.session_id}")
+            response = self.http.get(f"{BASE_URL}/sessions/{self.session_id}")
             data = response.json()
             
             print(f"📊 Session Status:")
@@ -244,7 +272,7 @@ class PsyAssistCLI:
         
         try:
             payload = {"text": message}
-            response = requests.post(
+            response = self.http.post(
                 f"{BASE_URL}/sessions/{self.session_id}/risk-assessment",
                 json=payload
             )
@@ -258,8 +286,8 @@ class PsyAssistCLI:
         except Exception as e:
             print(f"❌ Risk assessment failed: {e}")
     
-    def run_demo(self):
-        """Run demo conversation."""
+    def run_demo(self, batch: bool = False):
+        """Run demo conversation, without pausing between messages in batch mode."""
         print("🎭 PsyAssist AI Demo")
         print("=" * 40)
         
@@ -284,9 +312,12 @@ class PsyAssistCLI:
             self.send_message(message)
             print()
             
-            if i < len(demo_messages):
+            if i < len(demo_messages) and not batch:
                 input("Press Enter to continue...")
         
+        if batch:
+            self.show_session_status()
+        
         print("🎉 Demo completed!")
     
     def run_tests(self):
@@ -316,27 +347,12 @@ class PsyAssistCLI:
                 elif command in ['help', 'h', '?']:
                     self.print_banner()
                 
-                elif command == 'health':
-                    self.health_check()
-                
-                elif command == 'status':
-                    self.show_status()
-                
-                elif command == 'session':
-                    self.create_session()
-                
-                elif command == 'chat':
-                    self.interactive_chat()
-                
-                elif command == 'demo':
-                    self.run_demo()
-                
-                elif command == 'test':
-                    self.run_tests()
-                
                 elif command == '':
                     continue
                 
+                elif command in self.commands:
+                    self.commands[command]()
+                
                 else:
                     print(f"❓ Unknown command: {command}")
                     print("💡 Type 'help' for available commands")
@@ -357,6 +373,7 @@ def main():
     parser.add_argument('command', nargs='?', help='Command to run')
     parser.add_argument('--user-id', help='User ID for session')
     parser.add_argument('--message', help='Message to send')
+    parser.add_argument('--batch', action='store_true', help='Run the demo without pausing between messages')
     
     args = parser.parse_args()
     
@@ -370,21 +387,17 @@ def main():
     
     # Run specific command or interactive mode
     if args.command:
-        if args.command == 'health':
-            cli.health_check()
-        elif args.command == 'status':
-            cli.show_status()
-        elif args.command == 'session':
-            cli.create_session(args.user_id)
-        elif args.command == 'chat':
-            cli.interactive_chat()
-        elif args.command == 'demo':
-            cli.run_demo()
-        elif args.command == 'test':
-            return cli.run_tests()
-        else:
+        handler = cli.commands.get(args.command)
+        if handler is None:
             print(f"❓ Unknown command: {args.command}")
             return 1
+        
+        # Pass through the options that apply to this command
+        options = {
+            'session': {'user_id': args.user_id},
+            'demo': {'batch': args.batch},
+        }.get(args.command, {})
+        return handler(**options) or 0
     else:
         cli.interactive_menu()
     
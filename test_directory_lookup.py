@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Tests for directory lookup caching.
+"""
+
+import asyncio
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from psyassist.tools.directory_lookup import APIDirectoryLookup, DirectoryLookup
+
+
+def test_mock_resources_are_copies():
+    """Callers cannot change the shared mock directory through returned lists."""
+    lookup = DirectoryLookup()
+    resources = asyncio.run(lookup.get_resources('us'))
+    resources.clear()
+    assert asyncio.run(lookup.get_resources('US'))
+
+
+def test_get_by_id():
+    """Resources are found by ID in their location only."""
+    lookup = DirectoryLookup()
+    resource = asyncio.run(lookup.get_by_id('us', "crisis_text_line"))
+    assert resource.resource_id == "crisis_text_line"
+    assert asyncio.run(lookup.get_by_id('US', "missing")) is None
+
+
+def test_clear_cache_drops_api_responses():
+    """Cached API responses are served until the cache is cleared."""
+    lookup = DirectoryLookup()
+    lookup.lookup = APIDirectoryLookup("http://directory.invalid")
+    resource = asyncio.run(DirectoryLookup().get_by_id('US', "crisis_text_line"))
+    lookup.lookup._cache_put(('resources', 'US', None), [resource])
+
+    # Served from the cache, without any request to the API
+    assert asyncio.run(lookup.get_by_id('US', "crisis_text_line")) is resource
+
+    lookup.clear_cache()
+    assert lookup.lookup._cache_get(('resources', 'US', None)) is None
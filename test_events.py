@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for event batch serialization.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from psyassist.config.settings import settings
+from psyassist.core.orchestrator import PsyAssistOrchestrator
+from psyassist.schemas.events import BaseEvent, EventBatch, EventBatchColumnar, EventType
+
+
+async def _published_batches(monkeypatch):
+    """Run a short conversation and return the JSON of every batch it published."""
+    payloads = []
+    to_json = EventBatch.to_json
+
+    def capture(batch):
+        payload = to_json(batch)
+        payloads.append(payload)
+        return payload
+
+    monkeypatch.setattr(EventBatch, 'to_json', capture)
+
+    orchestrator = PsyAssistOrchestrator()
+    session = await orchestrator.create_session(user_id="test_user", metadata={"location": "US"})
+    await orchestrator.process_message(session.session_id, "Hello, I need some help")
+    await orchestrator.assess_risk(session.session_id, "I've been thinking about suicide")
+
+    resources = await orchestrator.get_resources(session.session_id)
+    await orchestrator.initiate_escalation(session.session_id, resources[0]['resource_id'])
+    await orchestrator.close_session(session.session_id, "test_completed")
+
+    # Let the publisher flush its last batch
+    await asyncio.sleep(2 * settings.event_batch_interval_ms / 1000)
+    orchestrator._publisher_task.cancel()
+    return payloads
+
+
+def test_published_batches_round_trip(monkeypatch):
+    """Batches published by the orchestrator validate against the EventBatch schema."""
+    payloads = asyncio.run(_published_batches(monkeypatch))
+    assert payloads
+
+    event_types = []
+    for payload in payloads:
+        batch = EventBatch.model_validate_json(payload)
+        published = json.loads(payload)
+        assert batch.batch_id == published['batch_id']
+        assert [event.event_id for event in batch.events] == [event['event_id'] for event in published['events']]
+        assert [event.metadata for event in batch.events] == [event['metadata'] for event in published['events']]
+        event_types.extend(event.event_type for event in batch.events)
+
+    assert {
+        EventType.SESSION_CREATED,
+        EventType.MESSAGE_RECEIVED,
+        EventType.MESSAGE_SENT,
+        EventType.RISK_ASSESSED,
+        EventType.ESCALATION_INITIATED,
+        EventType.SESSION_CLOSED,
+    } <= set(event_types)
+    # A message is received before the state machine produces the reply
+    assert event_types.index(EventType.MESSAGE_RECEIVED) < event_types.index(EventType.MESSAGE_SENT)
+
+
+def test_columnar_round_trip():
+    """Columnar batches keep event fields and accept naive and aware timestamps."""
+    events = [
+        BaseEvent.model_validate_json(
+            '{"event_id": "e1", "event_type": "session.created", "session_id": "s1",'
+            ' "timestamp": "2024-05-01T12:30:00.123456Z", "priority": "HIGH", "source": "test"}'
+        ),
+        BaseEvent(
+            event_id="e2",
+            event_type=EventType.MESSAGE_SENT,
+            session_id="s1",
+            timestamp=datetime(2024, 5, 1, 12, 30, 1),
+            source="test",
+            user_id="u1",
+            metadata={'agent': "Greeter"}
+        ),
+        BaseEvent(
+            event_id="e3",
+            event_type=EventType.RISK_ASSESSED,
+            session_id="s2",
+            timestamp=datetime(2024, 5, 1, 14, 30, 2, tzinfo=timezone(timedelta(hours=2))),
+            source="test"
+        ),
+    ]
+
+    columns = EventBatchColumnar.from_events(events)
+    assert columns.event_type_counts() == {
+        EventType.SESSION_CREATED: 1, EventType.MESSAGE_SENT: 1, EventType.RISK_ASSESSED: 1
+    }
+
+    rebuilt = columns.to_events()
+    assert [event.timestamp for event in rebuilt] == [
+        datetime(2024, 5, 1, 12, 30, 0, 123456, tzinfo=timezone.utc),
+        datetime(2024, 5, 1, 12, 30, 1, tzinfo=timezone.utc),
+        datetime(2024, 5, 1, 12, 30, 2, tzinfo=timezone.utc),
+    ]
+    for original, event in zip(events, rebuilt):
+        assert event.model_dump(exclude={'timestamp'}) == original.model_dump(exclude={'timestamp'})
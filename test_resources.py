@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for resource lookups by ID.
+"""
+
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from psyassist.schemas.resources import (
+    ContactMethod, EscalationPlan, Resource, ResourceBundle, ResourceCategory, ResourceDirectory, ResourceType
+)
+
+
+def _resource(resource_id: str) -> Resource:
+    return Resource(
+        resource_id=resource_id,
+        name=resource_id,
+        type=ResourceType.HOTLINE,
+        category=ResourceCategory.GENERAL_SUPPORT,
+        contact_methods=[ContactMethod.PHONE],
+        description="Test resource"
+    )
+
+
+def test_directory_get_follows_mutations():
+    """Lookups see resources appended, replaced and reassigned after the first lookup."""
+    directory = ResourceDirectory(
+        directory_id="d1", name="Test", version="1", source="test", resources=[_resource('a')]
+    )
+    assert directory.get('a').resource_id == 'a'
+    assert directory.get('b') is None
+
+    directory.resources.append(_resource('b'))
+    assert directory.get('b').resource_id == 'b'
+
+    directory.resources[0] = _resource('c')
+    assert directory.get('a') is None
+    assert directory.get('c').resource_id == 'c'
+
+    directory.resources = [_resource('d')]
+    assert directory.get('b') is None
+    assert directory.get('d').resource_id == 'd'
+
+
+def test_bundle_and_plan_lookups():
+    """Bundles look up their resources and plans their backup resources."""
+    bundle = ResourceBundle(bundle_id="b1", name="Test", description="Test", resources=[_resource('a')])
+    assert bundle.get('a') is bundle.resources[0]
+    bundle.resources.insert(0, _resource('b'))
+    assert bundle.get('a') is bundle.resources[1]
+
+    plan = EscalationPlan(
+        plan_id="p1", session_id="s1", escalation_type="warm", urgency_level="HIGH", reason="test",
+        primary_resource=_resource('a'), backup_resources=[_resource('b')]
+    )
+    assert plan.get_backup('a') is None
+    assert plan.get_backup('b') is plan.backup_resources[0]
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for the risk classifier escalation thresholds.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from psyassist.config.settings import settings
+from psyassist.schemas.risk import RiskAssessment, RiskSeverity
+from psyassist.tools.risk_classifier import RiskClassifier
+
+
+def _assessment(severity: RiskSeverity) -> RiskAssessment:
+    return RiskAssessment(
+        assessment_id="risk_test",
+        session_id="session_test",
+        overall_severity=severity,
+        overall_confidence=0.9
+    )
+
+
+@pytest.mark.parametrize("severity, expected", [
+    (RiskSeverity.CRITICAL, True),
+    (RiskSeverity.HIGH, True),
+    (RiskSeverity.MEDIUM, False),
+    (RiskSeverity.NONE, False),
+])
+def test_should_escalate_at_high_threshold(monkeypatch, severity, expected):
+    """Severities are compared by rank, not alphabetically."""
+    monkeypatch.setattr(settings, 'escalation_threshold', "HIGH")
+    assert RiskClassifier().should_escalate(_assessment(severity)) is expected
+
+
+@pytest.mark.parametrize("severity, expected", [
+    (RiskSeverity.CRITICAL, True),
+    (RiskSeverity.HIGH, False),
+    (RiskSeverity.NONE, False),
+])
+def test_is_emergency_at_critical_threshold(monkeypatch, severity, expected):
+    """Only assessments at or above the emergency threshold are emergencies."""
+    monkeypatch.setattr(settings, 'emergency_threshold', "CRITICAL")
+    assert RiskClassifier().is_emergency(_assessment(severity)) is expected
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Tests for the JSON schemas of the exported models.
+"""
+
+import inspect
+import os
+import sys
+
+import pytest
+from pydantic import BaseModel
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import psyassist.schemas as schemas
+from psyassist.schemas import json_schema_for
+
+
+# Every pydantic model exported by psyassist.schemas
+MODELS = sorted(
+    (value for value in vars(schemas).values()
+     if inspect.isclass(value) and issubclass(value, BaseModel) and value is not BaseModel),
+    key=lambda model: model.__name__
+)
+
+
+@pytest.mark.parametrize("model", MODELS, ids=lambda model: model.__name__)
+def test_json_schema_for_exported_models(model):
+    """Every exported model has a JSON schema, cached per class."""
+    schema = json_schema_for(model)
+    assert schema['title'] == model.__name__
+    assert json_schema_for(model) is schema
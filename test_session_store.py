@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the two-tier session store.
+"""
+
+import gc
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from psyassist.core.session_store import SessionStore
+from psyassist.schemas.session import Session
+
+
+def test_spill_and_promote(tmp_path):
+    """Sessions spilled to disk come back with their data."""
+    store = SessionStore(str(tmp_path / "sessions"), hot_size=1)
+    store['a'] = Session(session_id='a', message_count=3)
+    store['b'] = Session(session_id='b')
+    gc.collect()
+
+    assert list(store.hot) == ['b']
+    assert 'a' in store.cold
+    assert len(store) == 2
+
+    session = store['a']
+    assert session.message_count == 3
+    assert list(store.hot) == ['a']
+    assert 'b' in store.cold
+    store.close()
+
+
+def test_promote_keeps_live_session(tmp_path):
+    """A session held by a caller while spilled keeps its later changes."""
+    store = SessionStore(str(tmp_path / "sessions"), hot_size=1)
+    store['a'] = Session(session_id='a')
+    live = store['a']
+    store['b'] = Session(session_id='b')
+
+    live.message_count = 42
+
+    assert store['a'] is live
+    assert store['a'].message_count == 42
+    store.close()
+
+
+def test_pinned_session_is_not_spilled(tmp_path):
+    """Pinned sessions stay in memory, spilling the next unpinned one instead."""
+    pinned = {'a'}
+    store = SessionStore(str(tmp_path / "sessions"), hot_size=1, pinned=pinned.__contains__)
+    store['a'] = Session(session_id='a')
+    store['b'] = Session(session_id='b')
+    assert list(store.hot) == ['a']
+
+    # With every session pinned the hot tier grows past its size
+    pinned.add('c')
+    store['c'] = Session(session_id='c')
+    assert list(store.hot) == ['a', 'c']
+    store.close()
+
+
+def test_close_writes_back_spilled_sessions(tmp_path):
+    """Closing the store persists changes made to spilled sessions still in use."""
+    path = str(tmp_path / "sessions")
+    store = SessionStore(path, hot_size=1)
+    store['a'] = Session(session_id='a')
+    live = store['a']
+    store['b'] = Session(session_id='b')
+    live.message_count = 7
+    store.close()
+
+    reopened = SessionStore(path, hot_size=1)
+    assert reopened['a'].message_count == 7
+    assert reopened['b'].session_id == 'b'
+    reopened.close()
+
+
+def test_len_tracks_both_tiers(tmp_path):
+    """The session count follows spills, promotions, deletions and reopening."""
+    path = str(tmp_path / "sessions")
+    store = SessionStore(path, hot_size=1)
+    store['a'] = Session(session_id='a')
+    store['b'] = Session(session_id='b')
+    store['c'] = Session(session_id='c')
+    assert len(store) == 3
+
+    store['a']
+    assert len(store) == 3
+    del store['b']
+    assert len(store) == 2
+    store['c'] = Session(session_id='c')
+    assert len(store) == 2
+    store.close()
+
+    reopened = SessionStore(path, hot_size=1)
+    assert len(reopened) == 2
+    reopened.close()